@@ -13,18 +13,18 @@ class CountryAdmin(admin.ModelAdmin):
 class LanguageAdmin(admin.ModelAdmin):
     list_display = ("code", "name")
     search_fields = ("code", "name")
-    filter_horizontal = ("countries",)
+    autocomplete_fields = ("countries",)
 
 
 @admin.register(Timezone)
 class TimezoneAdmin(admin.ModelAdmin):
     list_display = ("name", "label", "offset_seconds")
     search_fields = ("name",)
-    filter_horizontal = ("countries",)
+    autocomplete_fields = ("countries",)
 
 
 @admin.register(Currency)
 class CurrencyAdmin(admin.ModelAdmin):
     list_display = ("code", "name")
     search_fields = ("code", "name")
-    filter_horizontal = ("countries",)
+    autocomplete_fields = ("countries",)
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-15 23:07
+"""
+Lower-case every Language.code, then enforce it with a check constraint.
+
+pycountry's ISO 639 codes are already lower-case, so the data step is a
+no-op on a freshly loaded table; it only guards hand-edited rows.
+"""
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def lowercase_codes(apps, schema_editor):
+    Language = apps.get_model("core", "Language")
+    Language.objects.exclude(code=Lower("code")).update(code=Lower("code"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_codes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="language",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("code", django.db.models.functions.text.Lower("code"))
+                ),
+                name="language_code_lowercase",
+            ),
+        ),
+    ]
@@ -8,6 +8,7 @@ Abstract base classes (Categories A and B) and reference / lookup tables
 import uuid
 
 from django.db import models
+from django.db.models.functions import Lower
 
 # ---------------------------------------------------------------------------
 # Category B — TimeStampedAuditModel
@@ -16,7 +17,7 @@ from django.db import models
 
 
 class TimeStampedAuditModel(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid.uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.UUIDField(null=True, blank=True)  # acting user UUID — no FK
     updated_at = models.DateTimeField(auto_now=True)
@@ -77,6 +78,13 @@ class Language(models.Model):
 
     class Meta:
         ordering = ["name"]
+        constraints = [
+            # Stored lower-case so lookups are plain equality on the unique index.
+            models.CheckConstraint(
+                condition=models.Q(code=Lower("code")),
+                name="language_code_lowercase",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -0,0 +1,131 @@
+"""
+Read-side helpers for reference data.
+
+Country, Language and Timezone rows only change when ``load_reference_data``
+runs, so the ``(pk, label)`` choice lists rendered by the profile forms, the
+name/code → pk maps used at registration and the timezone → country lookup
+used during onboarding are cached per process.
+
+Each process remembers the reference-data version (a counter in Django's
+cache) its memoized values were built under, and drops them as soon as the
+shared version moves on. ``clear_reference_caches()`` bumps that version; it is
+called from the receivers in ``apps.core.signals`` and at the end of
+``load_reference_data`` (bulk writes send no signals), so a load in one process
+reaches every web worker that shares the cache backend.
+"""
+
+import functools
+import uuid
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from django.core.cache import cache
+
+from apps.core.models import Country, Language, Timezone
+
+_VERSION_KEY = "reference:version"
+
+# Every memoized selector, and the shared version they were filled under.
+_memoized = []
+_seen_version = None
+
+
+def _reference_cache(maxsize=None):
+    """
+    ``functools.lru_cache`` that is dropped whenever the shared version changes.
+
+    Any difference counts, not only an increase, so an evicted version key
+    also invalidates.
+    """
+
+    def decorator(func):
+        cached = functools.lru_cache(maxsize=maxsize)(func)
+        _memoized.append(cached)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            global _seen_version
+            version = cache.get(_VERSION_KEY)
+            if version != _seen_version:
+                _clear_memoized()
+                _seen_version = version
+            return cached(*args)
+
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+
+    return decorator
+
+
+def _clear_memoized() -> None:
+    for cached in _memoized:
+        cached.cache_clear()
+
+
+@_reference_cache()
+def timezone_choices() -> tuple[tuple[str, str], ...]:
+    """``(pk, label)`` pairs for every Timezone, ordered by IANA name."""
+    return tuple(
+        (str(pk), label)
+        for pk, label in Timezone.objects.order_by("name").values_list("pk", "label")
+    )
+
+
+@_reference_cache()
+def country_choices() -> tuple[tuple[str, str], ...]:
+    """``(pk, name)`` pairs for every Country, ordered by name."""
+    return tuple(
+        (str(pk), name)
+        for pk, name in Country.objects.order_by("name").values_list("pk", "name")
+    )
+
+
+@_reference_cache()
+def timezone_ids_by_name() -> Mapping[str, uuid.UUID]:
+    """Read-only ``{IANA name: pk}`` map of every Timezone."""
+    return MappingProxyType(dict(Timezone.objects.values_list("name", "pk")))
+
+
+@_reference_cache()
+def language_ids_by_code() -> Mapping[str, uuid.UUID]:
+    """Read-only ``{code: pk}`` map of every Language (codes are lower-case)."""
+    return MappingProxyType(dict(Language.objects.values_list("code", "pk")))
+
+
+@_reference_cache(maxsize=1024)
+def timezone_country_code(tz_name: str) -> str:
+    """
+    Alphabetically first country code linked to the IANA timezone *tz_name*.
+
+    Returns an empty string for unknown timezones or timezones with no linked
+    country. Bounded because *tz_name* can come from a browser hint.
+    """
+    code = (
+        Country.objects.filter(timezones__name=tz_name)
+        .order_by("code")
+        .values_list("code", flat=True)
+        .first()
+    )
+    return code or ""
+
+
+def clear_reference_caches() -> None:
+    """Invalidate every cached reference-data selector, in every process."""
+    global _seen_version
+    try:
+        version = cache.incr(_VERSION_KEY)
+    except ValueError:
+        version = 1
+        cache.set(_VERSION_KEY, version, timeout=None)
+    _clear_memoized()
+    _seen_version = version
+
+
+__all__ = [
+    "timezone_choices",
+    "country_choices",
+    "timezone_ids_by_name",
+    "language_ids_by_code",
+    "timezone_country_code",
+    "clear_reference_caches",
+]
@@ -0,0 +1,24 @@
+"""
+Reference-data cache invalidation.
+
+Any save or delete of a Country, Language or Timezone, or any change to the
+Timezone ↔ Country links, drops the cached selectors in ``apps.core.selectors``
+so the next read sees fresh rows.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Country, Language, Timezone
+from .selectors import clear_reference_caches
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+@receiver(post_save, sender=Timezone)
+@receiver(post_delete, sender=Timezone)
+@receiver(m2m_changed, sender=Timezone.countries.through)
+def invalidate_reference_caches(sender, **kwargs) -> None:
+    clear_reference_caches()
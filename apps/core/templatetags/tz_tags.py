@@ -7,6 +7,7 @@ Usage:
     {{ some_utc_datetime|localtime:timezone_obj }}
 """
 
+import functools
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from django import template
@@ -14,6 +15,14 @@ from django.utils import timezone as django_timezone
 
 register = template.Library()
 
+_UTC = ZoneInfo("UTC")
+
+
+@functools.lru_cache(maxsize=512)
+def _zone(name: str) -> ZoneInfo:
+    """Return a (memoised) ZoneInfo for *name* — one lookup per zone per process."""
+    return ZoneInfo(name)
+
 
 @register.filter
 def localtime(value, tz):
@@ -41,17 +50,21 @@ def localtime(value, tz):
         return value
 
     try:
-        zone = ZoneInfo(tz_name)
-    except ZoneInfoNotFoundError, KeyError:
+        zone = _zone(tz_name)
+    except (ZoneInfoNotFoundError, KeyError):
         return value
 
     # Ensure value is aware before converting
     if django_timezone.is_naive(value):
-        value = django_timezone.make_aware(value, ZoneInfo("UTC"))
+        value = django_timezone.make_aware(value, _UTC)
 
     return value.astimezone(zone)
 
 
+# "A"–"Z" → Regional Indicator Symbols, applied in C by str.translate.
+_FLAG_TABLE = str.maketrans({chr(ord("A") + i): chr(0x1F1E6 + i) for i in range(26)})
+
+
 @register.filter
 def flag_emoji(country_code: str) -> str:
     """
@@ -63,9 +76,8 @@ def flag_emoji(country_code: str) -> str:
     Usage:
         {{ country.code|flag_emoji }}
     """
-    if not country_code or len(country_code) != 2:
+    if not isinstance(country_code, str) or len(country_code) != 2:
         return ""
-    try:
-        return "".join(chr(0x1F1E6 + ord(c.upper()) - ord("A")) for c in country_code)
-    except TypeError, ValueError:
+    if not (country_code.isascii() and country_code.isalpha()):
         return ""
+    return country_code.upper().translate(_FLAG_TABLE)
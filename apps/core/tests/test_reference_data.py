@@ -10,7 +10,8 @@ languages via pycountry).  They are skipped in the pre-commit hook
 from io import StringIO
 
 from django.core.management import call_command
-from django.test import TestCase, tag
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings, tag
 
 from apps.core.models import Country, Currency, Language, Timezone
 
@@ -43,6 +44,61 @@ class LoadReferenceDataCommandTest(TestCase):
         call_command("load_reference_data", stdout=StringIO())
         self.assertEqual(Country.objects.count(), first_count)
 
+    def test_rerun_updates_changed_rows(self) -> None:
+        """Rows edited since the last run are restored from the source data."""
+        call_command("load_reference_data", stdout=StringIO())
+        belgium = Country.objects.get(code="BE")
+        original_name = belgium.name
+        Country.objects.filter(pk=belgium.pk).update(name="Tampered")
+        call_command("load_reference_data", stdout=StringIO())
+        belgium.refresh_from_db()
+        self.assertEqual(belgium.name, original_name)
+
+    def test_rerun_does_not_duplicate_country_links(self) -> None:
+        """M2M links are bulk-inserted with ignore_conflicts on re-runs."""
+        call_command("load_reference_data", stdout=StringIO())
+        through = Timezone.countries.through
+        first_count = through.objects.count()
+        call_command("load_reference_data", stdout=StringIO())
+        self.assertEqual(through.objects.count(), first_count)
+
+    @override_settings(LOAD_REFERENCE_DATA_BATCH_SIZE=50)
+    def test_command_honours_batch_size_setting(self) -> None:
+        """A small batch size splits the inserts but loads the same rows."""
+        call_command("load_reference_data", stdout=StringIO())
+        self.assertGreater(Country.objects.count(), 200)
+        self.assertGreater(Language.objects.count(), 100)
+
+
+class ReferenceDataThroughTableTest(SimpleTestCase):
+    """
+    load_reference_data bulk-inserts M2M links with ignore_conflicts=True.
+
+    That relies on each auto-created through table carrying a unique
+    (owner, country) constraint, so ON CONFLICT is resolved by an index probe.
+    """
+
+    def test_through_tables_are_unique_per_pair(self) -> None:
+        for model, owner in (
+            (Timezone, "timezone"),
+            (Currency, "currency"),
+            (Language, "language"),
+        ):
+            with self.subTest(model=model.__name__):
+                through = model.countries.through
+                self.assertIn((owner, "country"), through._meta.unique_together)
+
+
+class LanguageCodeConstraintTest(TestCase):
+    """Language codes are stored lower-case so lookups can use plain equality."""
+
+    def test_upper_case_code_is_rejected(self) -> None:
+        with self.assertRaises(IntegrityError):
+            Language.objects.create(code="NL", name="Dutch")
+
+    def test_lower_case_code_is_accepted(self) -> None:
+        Language.objects.create(code="nl", name="Dutch")
+
 
 @tag("slow")
 class ReferenceDataRelationshipTest(TestCase):
@@ -0,0 +1,174 @@
+"""
+Tests for apps.core.selectors — cached reference-data lookups.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.core.models import Country, Language, Timezone
+from apps.core.selectors import (
+    clear_reference_caches,
+    country_choices,
+    language_ids_by_code,
+    timezone_choices,
+    timezone_country_code,
+    timezone_ids_by_name,
+)
+
+
+class ReferenceChoicesTest(TestCase):
+    """Choice lists are cached per process and dropped on any write."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.tz = Timezone.objects.create(
+            name="Europe/Brussels", label="Europe/Brussels (UTC+01:00)"
+        )
+        cls.be = Country.objects.create(code="BE", code3="BEL", name="Belgium")
+
+    def setUp(self) -> None:
+        clear_reference_caches()
+        self.addCleanup(clear_reference_caches)
+
+    def test_timezone_choices_use_label(self) -> None:
+        self.assertIn((str(self.tz.pk), self.tz.label), timezone_choices())
+
+    def test_country_choices_use_name(self) -> None:
+        self.assertIn((str(self.be.pk), "Belgium"), country_choices())
+
+    def test_second_call_is_served_from_cache(self) -> None:
+        timezone_choices()
+        country_choices()
+        with self.assertNumQueries(0):
+            timezone_choices()
+            country_choices()
+
+    def test_save_invalidates_cache(self) -> None:
+        country_choices()
+        self.be.name = "Belgique"
+        self.be.save()
+        self.assertIn((str(self.be.pk), "Belgique"), country_choices())
+
+    def test_delete_invalidates_cache(self) -> None:
+        timezone_choices()
+        pk = str(self.tz.pk)
+        self.tz.delete()
+        self.assertNotIn(pk, dict(timezone_choices()))
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ReferenceVersionTest(TestCase):
+    """A version bump in the shared cache reaches processes that missed the write."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.be = Country.objects.create(code="BE", code3="BEL", name="Belgium")
+
+    def setUp(self) -> None:
+        cache.clear()
+        clear_reference_caches()
+        self.addCleanup(clear_reference_caches)
+
+    def test_bump_from_another_process_invalidates(self) -> None:
+        country_choices()
+        # A write that sent no signal here, e.g. load_reference_data in another
+        # worker, which then bumped the shared version.
+        Country.objects.filter(pk=self.be.pk).update(name="Belgique")
+        self.assertIn((str(self.be.pk), "Belgium"), country_choices())
+        cache.incr("reference:version")
+        self.assertIn((str(self.be.pk), "Belgique"), country_choices())
+
+    def test_evicted_version_invalidates(self) -> None:
+        country_choices()
+        Country.objects.filter(pk=self.be.pk).update(name="Belgique")
+        cache.clear()
+        self.assertIn((str(self.be.pk), "Belgique"), country_choices())
+
+    def test_unchanged_version_is_served_from_cache(self) -> None:
+        country_choices()
+        with self.assertNumQueries(0):
+            country_choices()
+
+
+class ReferenceIdMapsTest(TestCase):
+    """Name/code → pk maps are cached and dropped on any write."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.tz = Timezone.objects.create(name="Europe/Brussels", label="Brussels")
+        cls.nl = Language.objects.create(code="nl", name="Dutch")
+
+    def setUp(self) -> None:
+        clear_reference_caches()
+        self.addCleanup(clear_reference_caches)
+
+    def test_timezone_by_name(self) -> None:
+        self.assertEqual(timezone_ids_by_name()["Europe/Brussels"], self.tz.pk)
+
+    def test_language_by_code(self) -> None:
+        self.assertEqual(language_ids_by_code()["nl"], self.nl.pk)
+
+    def test_second_call_is_served_from_cache(self) -> None:
+        timezone_ids_by_name()
+        language_ids_by_code()
+        with self.assertNumQueries(0):
+            timezone_ids_by_name()
+            language_ids_by_code()
+
+    def test_language_save_invalidates_cache(self) -> None:
+        language_ids_by_code()
+        fr = Language.objects.create(code="fr", name="French")
+        self.assertEqual(language_ids_by_code()["fr"], fr.pk)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_bump_from_another_process_invalidates(self) -> None:
+        cache.clear()
+        clear_reference_caches()
+        timezone_ids_by_name()
+        language_ids_by_code()
+        # Rows replaced without signals here, as in another worker's load.
+        Timezone.objects.filter(pk=self.tz.pk).update(name="Europe/Old")
+        Language.objects.filter(pk=self.nl.pk).update(code="xx")
+        tz = Timezone.objects.bulk_create(
+            [Timezone(name="Europe/Brussels", label="Brussels")]
+        )[0]
+        nl = Language.objects.bulk_create([Language(code="nl", name="Dutch")])[0]
+        cache.incr("reference:version")
+        self.assertEqual(timezone_ids_by_name()["Europe/Brussels"], tz.pk)
+        self.assertEqual(language_ids_by_code()["nl"], nl.pk)
+
+
+class TimezoneCountryCodeTest(TestCase):
+    """timezone_country_code is cached and dropped when links change."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.tz = Timezone.objects.create(name="Europe/Brussels", label="Brussels")
+        cls.lu = Country.objects.create(code="LU", code3="LUX", name="Luxembourg")
+        cls.be = Country.objects.create(code="BE", code3="BEL", name="Belgium")
+
+    def setUp(self) -> None:
+        clear_reference_caches()
+        self.addCleanup(clear_reference_caches)
+
+    def test_first_country_by_code(self) -> None:
+        self.tz.countries.add(self.lu, self.be)
+        self.assertEqual(timezone_country_code("Europe/Brussels"), "BE")
+
+    def test_unknown_timezone_returns_empty(self) -> None:
+        self.assertEqual(timezone_country_code("Mars/Olympus"), "")
+
+    def test_second_call_is_served_from_cache(self) -> None:
+        self.tz.countries.add(self.be)
+        timezone_country_code("Europe/Brussels")
+        with self.assertNumQueries(0):
+            self.assertEqual(timezone_country_code("Europe/Brussels"), "BE")
+
+    def test_link_change_invalidates_cache(self) -> None:
+        self.assertEqual(timezone_country_code("Europe/Brussels"), "")
+        self.tz.countries.add(self.lu)
+        self.assertEqual(timezone_country_code("Europe/Brussels"), "LU")
@@ -7,7 +7,7 @@ from datetime import timezone as dt_timezone
 
 from django.test import TestCase
 
-from apps.core.templatetags.tz_tags import localtime
+from apps.core.templatetags.tz_tags import flag_emoji, localtime
 
 
 class LocaltimeFilterTests(TestCase):
@@ -46,3 +46,16 @@ class LocaltimeFilterTests(TestCase):
         utc_dt = self._utc()
         result = localtime(utc_dt, "Invalid/Zone")
         self.assertEqual(result, utc_dt)
+
+
+class FlagEmojiFilterTests(TestCase):
+    def test_converts_alpha2_code(self):
+        self.assertEqual(flag_emoji("BE"), "\U0001f1e7\U0001f1ea")
+
+    def test_lowercase_code_is_accepted(self):
+        self.assertEqual(flag_emoji("be"), flag_emoji("BE"))
+
+    def test_invalid_codes_return_empty_string(self):
+        for code in ("", None, "B", "BEL", "1A", "É1"):
+            with self.subTest(code=code):
+                self.assertEqual(flag_emoji(code), "")
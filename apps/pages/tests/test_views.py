@@ -2,7 +2,7 @@
 Phase 2 tests for the pages app.
 
 Covers:
-- Health check endpoint (200, JSON body, db ok)
+- Health check endpoint (200, JSON body, db ok; 503 when the db is down)
 - Homepage (200, uses base.html, skip-link present)
 - Context processor injects SITE_NAME and current_theme
 - Dashboard redirects unauthenticated users to login
@@ -10,107 +10,208 @@ Covers:
 """
 
 import json
-
-from django.test import TestCase
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone as tz
+
+from apps.tenants.models import Tenant
+from apps.users.models import User, UserProfile
+
+
+class HealthCheckTests(SimpleTestCase):
+    # health() opens a DB connection but never queries or writes, so no
+    # per-test transaction is needed.
+    databases = {"default"}
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Every test only inspects the response — fetch it once per class.
+        cls.response = cls.client_class().get(reverse("health"))
 
-class HealthCheckTests(TestCase):
     def test_health_returns_200(self):
-        response = self.client.get(reverse("health"))
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.response.status_code, 200)
 
     def test_health_content_type_is_json(self):
-        response = self.client.get(reverse("health"))
-        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(self.response["Content-Type"], "application/json")
 
     def test_health_body_status_ok(self):
-        response = self.client.get(reverse("health"))
-        data = json.loads(response.content)
+        data = json.loads(self.response.content)
         self.assertEqual(data["status"], "ok")
 
     def test_health_body_db_ok(self):
-        response = self.client.get(reverse("health"))
-        data = json.loads(response.content)
+        data = json.loads(self.response.content)
         self.assertEqual(data["db"], "ok")
 
+    def test_health_issues_no_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("health"))
+        self.assertEqual(len(ctx.captured_queries), 0)
 
-class HomepageTests(TestCase):
-    def test_homepage_returns_200(self):
-        response = self.client.get(reverse("pages:home"))
+    def test_health_head_returns_200_without_body(self):
+        response = self.client.head(reverse("health"))
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+
+    def test_health_rejects_post(self):
+        response = self.client.post(reverse("health"))
+        self.assertEqual(response.status_code, 405)
+
+    def test_health_db_down_returns_503(self):
+        with patch(
+            "apps.pages.views.connection.ensure_connection",
+            side_effect=OperationalError,
+        ):
+            response = self.client.get(reverse("health"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            json.loads(response.content), {"status": "error", "db": "error"}
+        )
+
+
+class HomepageTests(SimpleTestCase):
+    # SimpleTestCase blocks DB access: any query added to the anonymous
+    # homepage (middleware, context processor) fails every test here.
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Every test only inspects the anonymous page — fetch it once per class.
+        cls.response = cls.client_class().get(reverse("pages:home"))
+
+    def test_homepage_returns_200(self):
+        self.assertEqual(self.response.status_code, 200)
+
+    def test_homepage_is_not_cached_as_a_whole(self):
+        # The page embeds a per-visitor CSRF token; only the hero is cached.
+        self.assertNotIn("max-age", self.response.get("Cache-Control", ""))
 
     def test_homepage_uses_base_template(self):
-        response = self.client.get(reverse("pages:home"))
-        self.assertTemplateUsed(response, "base.html")
-        self.assertTemplateUsed(response, "pages/home.html")
+        self.assertTemplateUsed(self.response, "base.html")
+        self.assertTemplateUsed(self.response, "pages/home.html")
 
     def test_homepage_has_skip_link(self):
         """Skip-to-content must be the first focusable element (WCAG AA)."""
-        response = self.client.get(reverse("pages:home"))
         # The skip link href must target #main-content
-        self.assertContains(response, 'href="#main-content"')
+        self.assertContains(self.response, 'href="#main-content"')
 
     def test_homepage_main_id_present(self):
         """<main id="main-content"> must exist for the skip link target."""
-        response = self.client.get(reverse("pages:home"))
-        self.assertContains(response, 'id="main-content"')
+        self.assertContains(self.response, 'id="main-content"')
 
     def test_homepage_html_lang_attribute_present(self):
         """<html lang="..."> must be dynamic, not hardcoded."""
-        response = self.client.get(reverse("pages:home"))
-        self.assertContains(response, "<html lang=")
+        self.assertContains(self.response, "<html lang=")
+
 
+class ContextProcessorTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url = reverse("pages:home")
 
-class ContextProcessorTests(TestCase):
     def test_site_name_injected(self):
-        response = self.client.get(reverse("pages:home"))
+        response = self.client.get(self.url)
         self.assertIn("SITE_NAME", response.context)
 
     def test_current_theme_injected(self):
-        response = self.client.get(reverse("pages:home"))
+        response = self.client.get(self.url)
         self.assertIn("current_theme", response.context)
 
     def test_current_theme_default_is_system(self):
         """Unauthenticated request with no cookie → theme is 'system'."""
-        response = self.client.get(reverse("pages:home"))
+        response = self.client.get(self.url)
         self.assertEqual(response.context["current_theme"], "system")
 
     def test_current_theme_from_cookie(self):
         """A 'theme' cookie value is picked up for unauthenticated requests."""
         self.client.cookies["theme"] = "night"
-        response = self.client.get(reverse("pages:home"))
+        response = self.client.get(self.url)
         self.assertEqual(response.context["current_theme"], "night")
 
 
 class DashboardTests(TestCase):
-    def setUp(self):
-        from django.contrib.auth import get_user_model
-        from django.utils import timezone as tz
-
-        from apps.tenants.models import Tenant
-
-        User = get_user_model()
-        self.user = User.objects.create_user(  # noqa: S106
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = reverse("pages:dashboard")
+        cls.user = User.objects.create_user(  # noqa: S106
             email="dash@example.com",
             password="testpass123",
         )
         # Complete onboarding so ProfileCompleteMiddleware passes through
-        tenant = Tenant.objects.create(organization="Dash Corp")
-        p = self.user.profile
+        cls.tenant = Tenant.objects.create(organization="Dash Corp")
+        p = cls.user.profile
         p.profile_completed_at = tz.now()
-        p.tenant = tenant
+        p.tenant = cls.tenant
         p.role = "admin"
         p.tenant_joined_at = tz.now()
         p.save()
 
+        # One authenticated session for the whole class, instead of a
+        # force_login() session write in every test.
+        session = SessionStore()
+        session[SESSION_KEY] = str(cls.user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = cls.user.get_session_auth_hash()
+        session.create()
+        cls.session_key = session.session_key
+
+    def _login(self):
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = self.session_key
+
     def test_dashboard_redirects_anonymous(self):
-        response = self.client.get(reverse("pages:dashboard"))
+        response = self.client.get(self.url)
         self.assertEqual(response.status_code, 302)
         self.assertIn("/login/", response["Location"])
 
     def test_dashboard_accessible_when_authenticated(self):
-        self.client.force_login(self.user)
-        response = self.client.get(reverse("pages:dashboard"))
+        self._login()
+        response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "pages/dashboard.html")
+
+    def test_dashboard_query_count(self):
+        """Session, user + profile — pinned so middleware can't grow it unnoticed."""
+        self._login()
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class HomepageCachingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(  # noqa: S106
+            email="home@example.com", password="testpass123"
+        )
+        UserProfile.objects.filter(user=cls.user).update(
+            profile_completed_at=tz.now(),
+            tenant=Tenant.objects.create(organization="Home Corp"),
+            role="admin",
+            tenant_joined_at=tz.now(),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_theme_change_shows_on_next_request(self):
+        self.client.force_login(self.user)
+        self.client.post("/theme/set/", {"theme": "night"})
+        self.assertContains(self.client.get("/"), "var serverTheme = 'night'")
+        self.client.post("/theme/set/", {"theme": "corporate"})
+        self.assertContains(self.client.get("/"), "var serverTheme = 'corporate'")
+
+    def test_hero_fragment_is_cached_per_language(self):
+        self.client.get("/", HTTP_ACCEPT_LANGUAGE="nl-BE")
+        key = make_template_fragment_key("home_hero", ["nl-be", False])
+        self.assertIn("Aan de slag", cache.get(key))
@@ -6,16 +6,26 @@ Views for the pages app.
 - health    → machine-readable health check (/health/)
 """
 
-import json
-
 from django.contrib.auth.decorators import login_required
+from django.db import connection
 from django.http import HttpResponse
 from django.shortcuts import render
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.http import require_safe
+
+# Only two payloads are possible — serialise them once at import time.
+_HEALTH_OK = b'{"status": "ok", "db": "ok"}'
+_HEALTH_ERROR = b'{"status": "error", "db": "error"}'
 
 
 def home(request):
-    """Public homepage — unauthenticated landing page."""
+    """
+    Public homepage — unauthenticated landing page.
+
+    Not cached as a whole page: base.html carries a per-visitor CSRF token
+    and, for signed-in users, their theme, name and admin link. Only the
+    static hero is cached, as a template fragment (see pages/home.html).
+    """
     return render(request, "pages/home.html", {"page_title": _("Welcome")})
 
 
@@ -25,26 +35,24 @@ def dashboard(request):
     return render(request, "pages/dashboard.html", {"page_title": _("Dashboard")})
 
 
+@require_safe
 def health(request):
     """
     Machine-readable health check.
 
     Returns HTTP 200 when the application and database are reachable,
-    or HTTP 503 when the database is unavailable.
+    or HTTP 503 when the database is unavailable. Only GET and HEAD are
+    accepted; HEAD (common for load-balancer probes) still checks the
+    database but returns no body.
 
     Response: ``{"status": "ok", "db": "ok"}``
     """
-    db_status = "ok"
-    http_status = 200
-
     try:
-        from django.db import connection
-
         connection.ensure_connection()
     except Exception:  # noqa: BLE001
-        db_status = "error"
-        http_status = 503
-
-    overall = "ok" if http_status == 200 else "error"
-    payload = json.dumps({"status": overall, "db": db_status})
-    return HttpResponse(payload, content_type="application/json", status=http_status)
+        body, status = _HEALTH_ERROR, 503
+    else:
+        body, status = _HEALTH_OK, 200
+    if request.method == "HEAD":
+        body = b""
+    return HttpResponse(body, content_type="application/json", status=status)
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-15 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenants", "0002_add_logo_to_tenant"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="tenant",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("organization", ""), _negated=True),
+                name="tenant_org_nonempty",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-15 22:57
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenants", "0003_tenant_org_nonempty"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="tenant",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+    ]
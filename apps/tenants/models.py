@@ -29,6 +29,12 @@ class Tenant(TimeStampedAuditModel):
         verbose_name = _("tenant")
         verbose_name_plural = _("tenants")
         ordering = ["organization"]
+        constraints = [
+            models.CheckConstraint(
+                condition=~models.Q(organization=""),
+                name="tenant_org_nonempty",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.organization
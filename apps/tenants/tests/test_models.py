@@ -3,6 +3,7 @@ Tests for apps.tenants.
 """
 
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
 from apps.tenants.models import Tenant
@@ -20,6 +21,11 @@ class TenantModelTest(TestCase):
         with self.assertRaises(ValidationError):
             tenant.full_clean()
 
+    def test_empty_organization_rejected_by_db(self) -> None:
+        """The DB constraint also guards writes that skip full_clean()."""
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Tenant.objects.create(organization="")
+
     def test_tenant_uuid_pk(self) -> None:
         import uuid
 
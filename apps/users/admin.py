@@ -46,6 +46,7 @@ class UserProfileInline(admin.StackedInline):
     can_delete = False
     verbose_name_plural = _("profile")
     readonly_fields = ("id", "created_at", "updated_at", "profile_completed_at")
+    autocomplete_fields = ("language", "timezone", "country")
     extra = 0
 
 
@@ -56,3 +57,6 @@ class UserProfileAdmin(admin.ModelAdmin):
     search_fields = ("user__email", "display_name")
     readonly_fields = ("id", "created_at", "updated_at", "profile_completed_at")
     raw_id_fields = ("user", "tenant")
+    # Reference tables are large (7 000+ languages) — search via the admin's
+    # built-in Select2 autocomplete instead of rendering every <option>.
+    autocomplete_fields = ("language", "timezone", "country")
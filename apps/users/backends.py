@@ -0,0 +1,25 @@
+"""
+Authentication backend for the users app.
+
+Identical to Django's ModelBackend except that the per-request user lookup
+joins the UserProfile (and its Tenant) in the same query. Every authenticated
+request reads the profile (ProfileCompleteMiddleware, the theme context
+processor) and the members/settings views read ``profile.tenant``, so this
+saves up to two round trips per request while always reading fresh data — a
+revoked profile is seen on the very next request.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related(
+                "profile", "profile__tenant"
+            ).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -14,8 +14,8 @@ Forms for the users app.
 from django import forms
 from django.utils.translation import gettext_lazy as _
 
-from apps.core.models import Country, Timezone
-from apps.users.models import THEME_CHOICES, UserProfile
+from apps.core.selectors import country_choices, timezone_choices
+from apps.users.models import UserProfile
 
 
 class LoginForm(forms.Form):
@@ -68,12 +68,9 @@ class RegisterForm(forms.Form):
     country_detect = forms.CharField(required=False, widget=forms.HiddenInput())
 
     def clean_email(self):
-        from apps.users.models import User
-
-        email = self.cleaned_data["email"].lower()
-        if User.objects.filter(email=email).exists():
-            raise forms.ValidationError(_("An account with this email already exists."))
-        return email
+        # Uniqueness is enforced by the User.email constraint at insert time
+        # (see register_user) — no racy pre-check query here.
+        return self.cleaned_data["email"].lower()
 
 
 class ProfileCompleteForm(forms.ModelForm):
@@ -94,15 +91,21 @@ class ProfileCompleteForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["timezone"].queryset = Timezone.objects.all().order_by("name")
-        self.fields["timezone"].empty_label = _("Select your timezone")
+        # Reference data is near-static — render options from the cached
+        # choice list; the queryset (all rows) still validates submissions.
+        self.fields["timezone"].choices = [
+            ("", _("Select your timezone")),
+            *timezone_choices(),
+        ]
         self.fields["timezone"].widget.attrs.update(
             {"class": "select w-full text-base"}
         )
         self.fields["timezone"].required = False
 
-        self.fields["country"].queryset = Country.objects.all().order_by("name")
-        self.fields["country"].empty_label = _("Select your country")
+        self.fields["country"].choices = [
+            ("", _("Select your country")),
+            *country_choices(),
+        ]
         self.fields["country"].widget.attrs.update({"class": "select w-full text-base"})
         self.fields["country"].required = False
 
@@ -140,27 +143,25 @@ class ProfileSettingsForm(forms.ModelForm):
                 attrs={"autocomplete": "name", "class": "input w-full text-base"}
             ),
             "marketing_emails": forms.CheckboxInput(attrs={"class": "checkbox"}),
+            # Options come from UserProfile.theme's THEME_CHOICES.
+            "theme": forms.Select(attrs={"class": "select w-full text-base"}),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields["timezone"].queryset = Timezone.objects.all().order_by("name")
-        self.fields["timezone"].empty_label = _("Select timezone")
+        self.fields["timezone"].choices = [
+            ("", _("Select timezone")),
+            *timezone_choices(),
+        ]
         self.fields["timezone"].widget.attrs.update(
             {"class": "select w-full text-base"}
         )
         self.fields["timezone"].required = False
 
-        self.fields["country"].queryset = Country.objects.all().order_by("name")
-        self.fields["country"].empty_label = _("Select country")
+        self.fields["country"].choices = [("", _("Select country")), *country_choices()]
         self.fields["country"].widget.attrs.update({"class": "select w-full text-base"})
         self.fields["country"].required = False
 
-        self.fields["theme"].widget = forms.Select(
-            choices=THEME_CHOICES,
-            attrs={"class": "select w-full text-base"},
-        )
-
 
 class InviteMemberForm(forms.Form):
     email = forms.EmailField(
@@ -7,73 +7,156 @@ timezone, country, and language for a visitor's IP address.
 Returns a plain dict — never raises; falls back to empty strings on any error
 so callers can always safely do ``result.get("timezone", "")``.
 
-The function is deliberately synchronous (no async/Celery) — it is only called
-once during onboarding and the timeout is kept very short (1 s).
+Successful lookups are kept in Django's cache for 24 h, so repeat visits from
+the same IP (office egress, mobile NAT, retries) skip the HTTP round trip.
+Registration calls :func:`prefetch_from_ip` to warm that cache on a background
+thread, so the onboarding page that follows usually finds the answer already
+there; if it does not, :func:`lookup_from_ip` falls back to a synchronous call
+with a very short (1 s) timeout.
 """
 
+import http.client
+import ipaddress
 import json
 import logging
-from urllib.error import URLError
-from urllib.request import urlopen
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+from django.core.cache import cache
+
+from apps.core.selectors import timezone_country_code
 
 logger = logging.getLogger(__name__)
 
 # Mapping from ISO 3166-1 alpha-2 country code to the most common BCP-47
 # language tag used there.  This is a best-effort fallback; the actual
 # language tables are stored in core.Language and linked via M2M.
-_COUNTRY_LANG: dict[str, str] = {
-    "BE": "nl-BE",
-    "NL": "nl",
-    "FR": "fr",
-    "DE": "de",
-    "GB": "en-GB",
-    "US": "en-US",
-    "CA": "en-CA",
-    "AU": "en-AU",
-    "NZ": "en-NZ",
-    "ZA": "en-ZA",
-    "IN": "en-IN",
-    "SG": "en-SG",
-    "ES": "es",
-    "MX": "es-MX",
-    "AR": "es-AR",
-    "CO": "es-CO",
-    "PT": "pt",
-    "BR": "pt-BR",
-    "IT": "it",
-    "PL": "pl",
-    "RU": "ru",
-    "CN": "zh-CN",
-    "TW": "zh-TW",
-    "JP": "ja",
-    "KR": "ko",
-    "SE": "sv",
-    "NO": "nb",
-    "DK": "da",
-    "FI": "fi",
-    "CZ": "cs",
-    "SK": "sk",
-    "HU": "hu",
-    "RO": "ro",
-    "TR": "tr",
-    "IL": "he",
-    "SA": "ar",
-    "AE": "ar",
-    "EG": "ar",
-    "TH": "th",
-    "VN": "vi",
-    "ID": "id",
-    "MY": "ms",
-    "PH": "fil",
-    "UA": "uk",
-    "HR": "hr",
-    "RS": "sr",
-    "BG": "bg",
-    "GR": "el",
-}
-
-_API_URL = "http://ip-api.com/json/{ip}?fields=status,countryCode,timezone,lang"
+# Read-only: wrapped in MappingProxyType so no caller can mutate it.
+_COUNTRY_LANG: Mapping[str, str] = MappingProxyType(
+    {
+        "BE": "nl-BE",
+        "NL": "nl",
+        "FR": "fr",
+        "DE": "de",
+        "GB": "en-GB",
+        "US": "en-US",
+        "CA": "en-CA",
+        "AU": "en-AU",
+        "NZ": "en-NZ",
+        "ZA": "en-ZA",
+        "IN": "en-IN",
+        "SG": "en-SG",
+        "ES": "es",
+        "MX": "es-MX",
+        "AR": "es-AR",
+        "CO": "es-CO",
+        "PT": "pt",
+        "BR": "pt-BR",
+        "IT": "it",
+        "PL": "pl",
+        "RU": "ru",
+        "CN": "zh-CN",
+        "TW": "zh-TW",
+        "JP": "ja",
+        "KR": "ko",
+        "SE": "sv",
+        "NO": "nb",
+        "DK": "da",
+        "FI": "fi",
+        "CZ": "cs",
+        "SK": "sk",
+        "HU": "hu",
+        "RO": "ro",
+        "TR": "tr",
+        "IL": "he",
+        "SA": "ar",
+        "AE": "ar",
+        "EG": "ar",
+        "TH": "th",
+        "VN": "vi",
+        "ID": "id",
+        "MY": "ms",
+        "PH": "fil",
+        "UA": "uk",
+        "HR": "hr",
+        "RS": "sr",
+        "BG": "bg",
+        "GR": "el",
+    }
+)
+
+_API_HOST = "ip-api.com"
+_API_FIELDS = "status,countryCode,timezone,lang"
+_API_PATH = "/json/{ip}?fields=" + _API_FIELDS
+_API_BATCH_PATH = "/batch?fields=" + _API_FIELDS
+_API_BATCH_SIZE = 100  # ip-api.com's per-request limit for /batch
 _TIMEOUT = 1  # seconds — never block a page render
+_CACHE_TTL = 60 * 60 * 24  # seconds — IP → location changes rarely
+_CACHE_KEY = "geo:ip:{ip}"
+
+
+# Background lookups for prefetch_from_ip(). Small on purpose: it only ever
+# runs one short HTTP call per registration.
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="geo")
+
+# One keep-alive connection per thread: http.client connections are not
+# thread-safe, but each worker thread can reuse its own socket.
+_local = threading.local()
+
+
+def _api_call(method: str, path: str, body: bytes | None = None) -> bytes:
+    """
+    Send one request to ip-api.com over this thread's keep-alive connection.
+
+    Every lookup after the first skips the TCP handshake. If the server has
+    closed the idle socket, the request is retried once on a fresh connection;
+    timeouts and other errors are raised to the caller without a retry.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        try:
+            return _request(conn, method, path, body)
+        except (ConnectionResetError, BrokenPipeError):
+            pass  # stale keep-alive socket — reconnect below
+    _local.conn = http.client.HTTPConnection(_API_HOST, timeout=_TIMEOUT)
+    return _request(_local.conn, method, path, body)
+
+
+def _request(
+    conn: http.client.HTTPConnection, method: str, path: str, body: bytes | None
+) -> bytes:
+    """Send one request on *conn*; drop the connection on any transport error."""
+    try:
+        conn.request(method, path, body=body)
+        resp = conn.getresponse()
+        payload = resp.read()
+    except (http.client.HTTPException, OSError):
+        conn.close()
+        _local.conn = None
+        raise
+    if resp.status != 200:
+        raise http.client.HTTPException(f"ip-api returned HTTP {resp.status}")
+    return payload
+
+
+def _parse(data: object) -> dict[str, str] | None:
+    """Map one ip-api.com answer to our keys; None unless it succeeded."""
+    if not isinstance(data, dict) or data.get("status") != "success":
+        return None
+
+    result: dict[str, str] = {}
+
+    if tz := data.get("timezone", ""):
+        result["timezone"] = tz
+
+    if cc := data.get("countryCode", ""):
+        result["country"] = cc
+        if lang := _COUNTRY_LANG.get(cc):
+            result["language"] = lang
+
+    return result
 
 
 def lookup_from_ip(ip: str) -> dict:
@@ -86,53 +169,121 @@ def lookup_from_ip(ip: str) -> dict:
         language   — BCP-47 tag, e.g. "nl-BE"
 
     Returns an empty dict on any error (timeout, private IP, API failure, etc.).
-    Private / loopback IPs ("127.*", "::1", "10.*", "192.168.*") are silently
-    skipped to avoid wasting time during local development.
+    Private / loopback / link-local / reserved IPs (and anything that is not
+    an IP address) are silently skipped to avoid wasting time during local
+    development.
     """
     if not ip or _is_private(ip):
         return {}
 
+    cache_key = _CACHE_KEY.format(ip=ip)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        url = _API_URL.format(ip=ip)
-        with urlopen(url, timeout=_TIMEOUT) as resp:  # noqa: S310
-            data = json.loads(resp.read())
-    except (URLError, OSError, ValueError) as exc:
+        data = json.loads(_api_call("GET", _API_PATH.format(ip=ip)))
+    except (http.client.HTTPException, OSError, ValueError) as exc:
         logger.debug("ip-api lookup failed for %s: %s", ip, exc)
         return {}
 
-    if data.get("status") != "success":
+    result = _parse(data)
+    if result is None:
         return {}
 
-    result: dict[str, str] = {}
+    # Only successful answers are cached — a timeout should be retried.
+    cache.set(cache_key, result, _CACHE_TTL)
+    return result
 
-    if tz := data.get("timezone", ""):
-        result["timezone"] = tz
 
-    if cc := data.get("countryCode", ""):
-        result["country"] = cc
-        if lang := _COUNTRY_LANG.get(cc):
-            result["language"] = lang
+def prefetch_from_ip(ip: str) -> None:
+    """
+    Start :func:`lookup_from_ip` for *ip* on a background thread and return.
 
-    return result
+    The result lands in the cache, where the next request's
+    :func:`lookup_from_ip` picks it up without a network call. Private and
+    already-cached addresses are skipped.
+    """
+    if not ip or _is_private(ip) or _CACHE_KEY.format(ip=ip) in cache:
+        return
+    _EXECUTOR.submit(lookup_from_ip, ip)
+
+
+def lookup_from_ips(ips: list[str]) -> dict[str, dict]:
+    """
+    Resolve many IP addresses at once via ip-api.com's ``/batch`` endpoint.
+
+    Returns ``{ip: result}`` for every input, where each result has the same
+    shape as :func:`lookup_from_ip` (empty on failure or for private IPs).
+    Cached answers are reused; the rest are sent in POSTs of up to 100
+    addresses, so N lookups cost ⌈N / 100⌉ round trips instead of N.
+
+    Meant for bulk jobs — single lookups should keep using
+    :func:`lookup_from_ip`, because ip-api.com rate-limits ``/batch`` more
+    tightly than the single-IP endpoint.
+    """
+    results: dict[str, dict] = {ip: {} for ip in ips}
+    public = [ip for ip in results if ip and not _is_private(ip)]
+
+    keys = {_CACHE_KEY.format(ip=ip): ip for ip in public}
+    cached = cache.get_many(keys)
+    for key, value in cached.items():
+        results[keys[key]] = value
+    missing = [ip for key, ip in keys.items() if key not in cached]
+
+    fresh: dict[str, dict] = {}
+    for start in range(0, len(missing), _API_BATCH_SIZE):
+        chunk = missing[start : start + _API_BATCH_SIZE]
+        try:
+            body = json.dumps(chunk).encode()
+            answers = json.loads(_api_call("POST", _API_BATCH_PATH, body))
+        except (http.client.HTTPException, OSError, ValueError) as exc:
+            logger.debug("ip-api batch lookup failed for %d IPs: %s", len(chunk), exc)
+            continue
+        if not isinstance(answers, list):
+            logger.debug(
+                "ip-api batch lookup returned a non-list for %d IPs", len(chunk)
+            )
+            continue
+        if len(answers) != len(chunk):
+            logger.warning(
+                "ip-api batch lookup returned %d answers for %d IPs",
+                len(answers),
+                len(chunk),
+            )
+        # Answers come back in request order.
+        for ip, data in zip(chunk, answers, strict=False):
+            if (result := _parse(data)) is not None:
+                fresh[ip] = result
+
+    if fresh:
+        cache.set_many(
+            {_CACHE_KEY.format(ip=ip): result for ip, result in fresh.items()},
+            _CACHE_TTL,
+        )
+    results.update(fresh)
+    return results
 
 
 # Timezone name → preferred country code for cases where the tz maps to
 # multiple countries.  Named after a city in one country but legally shared.
 # Source: tzdata zone1970.tab + common sense.
-_TZ_COUNTRY_PREFERENCE: dict[str, str] = {
-    # Europe/Brussels covers BE, LU, NL — but the city is in Belgium
-    "Europe/Brussels": "BE",
-    # Europe/London covers GB + Crown Dependencies (GG, IM, JE)
-    "Europe/London": "GB",
-    # Pacific/Pago_Pago covers AS + UM — American Samoa is the main territory
-    "Pacific/Pago_Pago": "AS",
-    # America/Phoenix covers US + a small part of CA (Navajo Nation)
-    "America/Phoenix": "US",
-    # America/Toronto covers CA + BS (Bahamas uses EST)
-    "America/Toronto": "CA",
-    # Asia/Tokyo covers AU + JP — Japan is overwhelmingly dominant
-    "Asia/Tokyo": "JP",
-}
+_TZ_COUNTRY_PREFERENCE: Mapping[str, str] = MappingProxyType(
+    {
+        # Europe/Brussels covers BE, LU, NL — but the city is in Belgium
+        "Europe/Brussels": "BE",
+        # Europe/London covers GB + Crown Dependencies (GG, IM, JE)
+        "Europe/London": "GB",
+        # Pacific/Pago_Pago covers AS + UM — American Samoa is the main territory
+        "Pacific/Pago_Pago": "AS",
+        # America/Phoenix covers US + a small part of CA (Navajo Nation)
+        "America/Phoenix": "US",
+        # America/Toronto covers CA + BS (Bahamas uses EST)
+        "America/Toronto": "CA",
+        # Asia/Tokyo covers AU + JP — Japan is overwhelmingly dominant
+        "Asia/Tokyo": "JP",
+    }
+)
 
 
 def country_code_from_timezone(tz_name: str) -> str:
@@ -141,7 +292,8 @@ def country_code_from_timezone(tz_name: str) -> str:
 
     Uses a hardcoded preference map for known ambiguous timezones, then falls
     back to the first country in the DB's ``Timezone.countries`` M2M set
-    (ordered alphabetically by code).
+    (ordered alphabetically by code). The DB lookup is cached per process by
+    ``apps.core.selectors.timezone_country_code``.
 
     Returns an empty string if nothing can be inferred.
     """
@@ -152,15 +304,8 @@ def country_code_from_timezone(tz_name: str) -> str:
     if preferred := _TZ_COUNTRY_PREFERENCE.get(tz_name):
         return preferred
 
-    # Lazy import to avoid circular dependency at module load time
     try:
-        from apps.core.models import Timezone as TzModel  # noqa: PLC0415
-
-        tz_obj = TzModel.objects.filter(name=tz_name).first()
-        if tz_obj:
-            country = tz_obj.countries.order_by("code").first()
-            if country:
-                return country.code
+        return timezone_country_code(tz_name)
     except Exception as exc:  # noqa: BLE001
         logger.debug(
             "country_code_from_timezone lookup failed for %s: %s", tz_name, exc
@@ -170,25 +315,25 @@ def country_code_from_timezone(tz_name: str) -> str:
 
 
 def _is_private(ip: str) -> bool:
-    """Return True for loopback / RFC-1918 / link-local addresses."""
-    if ip.startswith("127.") or ip == "::1" or ip == "localhost":
-        return True
-    if ip.startswith("10.") or ip.startswith("192.168."):
+    """
+    Return True for addresses ip-api.com cannot geolocate.
+
+    Covers loopback, RFC-1918 / IPv6 ULA, link-local and reserved ranges.
+    Anything that does not parse as an IP address (e.g. "localhost") is
+    treated as private too.
+    """
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
         return True
-    # 172.16.0.0/12 — covers 172.16.x.x through 172.31.x.x
-    if ip.startswith("172."):
-        try:
-            second_octet = int(ip.split(".")[1])
-            if 16 <= second_octet <= 31:
-                return True
-        except IndexError, ValueError:
-            pass
-    return False
+    return addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved
 
 
 def get_client_ip(request) -> str:
     """Extract the real client IP from the request (respects X-Forwarded-For)."""
     xff = request.META.get("HTTP_X_FORWARDED_FOR", "")
     if xff:
-        return xff.split(",")[0].strip()
+        # Only the left-most hop is the client — partition avoids building a
+        # list of every proxy in the chain.
+        return xff.partition(",")[0].strip()
     return request.META.get("REMOTE_ADDR", "")
@@ -0,0 +1,28 @@
+"""
+Password hashers for the users app.
+
+Registration and login spend nearly all their time in the password hasher, so
+its cost is a deployment setting rather than Django's release default: measure
+the production CPU with ``manage.py calibrate_password_hasher`` and pin the
+result in ``PASSWORD_PBKDF2_ITERATIONS``.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count from ``PASSWORD_PBKDF2_ITERATIONS``.
+
+    Keeps the ``pbkdf2_sha256`` algorithm name, so existing hashes still
+    verify; any hash stored with a different count is re-encoded at the next
+    successful login (``must_update``). The setting can only raise the cost:
+    a value below Django's default is ignored, since that re-encoding would
+    otherwise quietly weaken every stored hash.
+    """
+
+    @property
+    def iterations(self) -> int:
+        tuned = getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", None) or 0
+        return max(tuned, PBKDF2PasswordHasher.iterations)
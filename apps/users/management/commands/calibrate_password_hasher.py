@@ -0,0 +1,54 @@
+"""
+Management command: calibrate_password_hasher
+
+Times PBKDF2-SHA256 on this machine and prints the iteration count that makes
+one password hash take about ``--target-ms`` milliseconds. Run it on the
+production host and pin the result in the PASSWORD_PBKDF2_ITERATIONS
+environment variable.
+
+Usage:
+    uv run python manage.py calibrate_password_hasher --target-ms 250
+"""
+
+import time
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand
+
+_SAMPLE_ITERATIONS = 100_000
+
+
+class Command(BaseCommand):
+    help = "Suggest a PASSWORD_PBKDF2_ITERATIONS value for a target hash time."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--target-ms",
+            type=int,
+            default=250,
+            help="Wall time one password hash should take (default: 250).",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=5,
+            help="Timing samples; the fastest is used (default: 5).",
+        )
+
+    def handle(self, *args, target_ms: int, rounds: int, **options) -> None:
+        hasher = PBKDF2PasswordHasher()
+        salt = hasher.salt()
+        best = float("inf")
+        for _ in range(max(rounds, 1)):
+            start = time.perf_counter()
+            hasher.encode("calibration-password", salt, _SAMPLE_ITERATIONS)
+            best = min(best, time.perf_counter() - start)
+
+        per_iteration = best / _SAMPLE_ITERATIONS
+        suggested = int(target_ms / 1000 / per_iteration)
+        # Never suggest less than Django's own default.
+        suggested = max(suggested, PBKDF2PasswordHasher.iterations)
+        self.stdout.write(
+            f"{_SAMPLE_ITERATIONS:,} iterations took {best * 1000:.1f} ms; "
+            f"suggested PASSWORD_PBKDF2_ITERATIONS={suggested}"
+        )
@@ -1,5 +1,6 @@
 """
 ProfileCompleteMiddleware — two-step onboarding gate.
+LegacySessionBackendMiddleware — keeps pre-ProfileModelBackend sessions valid.
 
 Runs after AuthenticationMiddleware.
 
@@ -15,9 +16,15 @@ Decision logic for authenticated users:
 Anonymous users and exempt URLs are always passed through.
 """
 
+import functools
+import re
+
 from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.middleware import get_user
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
 
 # URLs that are never intercepted by the gate.
 _ALWAYS_EXEMPT = {
@@ -38,15 +45,27 @@ _ALWAYS_EXEMPT = {
 }
 
 
+# Path prefixes that are exempt along with everything beneath them.
+_EXEMPT_PREFIXES = ("/admin/", "/invite/")
+
+
+@functools.cache
+def _exempt_pattern(extra: tuple[str, ...]) -> re.Pattern[str]:
+    """
+    Compile every exempt rule into one anchored regex.
+
+    _ALWAYS_EXEMPT entries match exactly; _EXEMPT_PREFIXES and the
+    PROFILE_GATE_EXEMPT_URLS setting match as prefixes. Keyed on the setting's
+    contents so override_settings gets its own pattern.
+    """
+    exact = "|".join(re.escape(url) for url in sorted(_ALWAYS_EXEMPT))
+    prefixes = "|".join(re.escape(url) for url in (*_EXEMPT_PREFIXES, *extra))
+    return re.compile(rf"(?:{exact})\Z|(?:{prefixes})")
+
+
 def _is_exempt(path: str) -> bool:
-    if path in _ALWAYS_EXEMPT:
-        return True
-    # Allow any URL under /admin/ or /invite/
-    if path.startswith("/admin/") or path.startswith("/invite/"):
-        return True
-    # Allow custom exempt list from settings
-    extra: list[str] = getattr(settings, "PROFILE_GATE_EXEMPT_URLS", [])
-    return any(path.startswith(url) for url in extra)
+    extra = tuple(getattr(settings, "PROFILE_GATE_EXEMPT_URLS", ()))
+    return _exempt_pattern(extra).match(path) is not None
 
 
 class ProfileCompleteMiddleware:
@@ -54,25 +73,59 @@ class ProfileCompleteMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        if request.user.is_authenticated and not _is_exempt(request.path):
-            profile = getattr(request.user, "profile", None)
-            if profile is not None:
-                next_param = f"?next={request.path}"
-
-                # Step 1 gate: profile not yet completed and not skipped
-                if profile.profile_completed_at is None and not request.session.get(
-                    "skip_profile_gate"
-                ):
-                    return redirect(reverse("users:profile_complete") + next_param)
-
-                # Step 2 gate: no tenant assigned yet
-                if profile.tenant_id is None:
-                    return redirect(
-                        reverse("users:onboarding_create_tenant") + next_param
-                    )
-
-                # Revocation gate
-                if not profile.is_active:
-                    return redirect(reverse("users:account_revoked"))
+        # Check the path first: it is a cheap regex match, whereas touching
+        # request.user loads the session and user from the DB.
+        if _is_exempt(request.path) or not request.user.is_authenticated:
+            return self.get_response(request)
+
+        profile = getattr(request.user, "profile", None)
+        if profile is not None:
+            next_param = f"?next={request.path}"
+
+            # Step 1 gate: profile not yet completed and not skipped
+            if profile.profile_completed_at is None and not request.session.get(
+                "skip_profile_gate"
+            ):
+                return redirect(reverse("users:profile_complete") + next_param)
+
+            # Step 2 gate: no tenant assigned yet
+            if profile.tenant_id is None:
+                return redirect(reverse("users:onboarding_create_tenant") + next_param)
+
+            # Revocation gate
+            if not profile.is_active:
+                return redirect(reverse("users:account_revoked"))
+
+        return self.get_response(request)
 
+
+_LEGACY_BACKEND = "django.contrib.auth.backends.ModelBackend"
+
+
+def _get_user(request):
+    session = request.session
+    if session.get(BACKEND_SESSION_KEY) == _LEGACY_BACKEND:
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    return get_user(request)
+
+
+class LegacySessionBackendMiddleware:
+    """
+    Point sessions created under the stock ModelBackend at ProfileModelBackend.
+
+    Runs right after AuthenticationMiddleware. ``django.contrib.auth.get_user``
+    drops any session whose stored backend path is not in
+    AUTHENTICATION_BACKENDS. Listing ModelBackend there to keep such sessions
+    alive would make every failed login run the user lookup and the password
+    hasher a second time. Rewriting the stored path instead keeps
+    authentication on ProfileModelBackend alone. Like the stock request.user,
+    this stays lazy — requests that never touch the user never load the
+    session.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(lambda: _get_user(request))
         return self.get_response(request)
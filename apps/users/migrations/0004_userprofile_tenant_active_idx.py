@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-15 22:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+        ("tenants", "0003_tenant_org_nonempty"),
+        ("users", "0003_remove_currency_from_userprofile"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["tenant", "is_active"], name="userprofile_tenant_active_idx"
+            ),
+        ),
+    ]
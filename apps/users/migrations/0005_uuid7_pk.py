@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-15 22:57
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_userprofile_tenant_active_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="userprofile",
+            name="id",
+            field=models.UUIDField(
+                default=uuid.uuid7, editable=False, primary_key=True, serialize=False
+            ),
+        ),
+    ]
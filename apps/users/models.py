@@ -67,7 +67,7 @@ class User(AbstractUser):
     - NEVER hard-delete a User. Set is_active = False only.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid.uuid7, editable=False)
     username = None  # remove the username field entirely
 
     email = models.EmailField(
@@ -211,6 +211,13 @@ class UserProfile(TimeStampedAuditModel):
     class Meta:
         verbose_name = _("user profile")
         verbose_name_plural = _("user profiles")
+        indexes = [
+            # Member listings and active-member counts filter on both.
+            models.Index(
+                fields=["tenant", "is_active"],
+                name="userprofile_tenant_active_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Profile({self.user.email})"
@@ -234,10 +241,8 @@ def derive_display_name(email: str) -> str:
         peter.janssens@acme.com  → "Peter"
         alice@example.com        → "Alice"
     """
-    local = email.split("@")[0]
-    if "." in local:
-        local = local.split(".")[0]
-    return local.capitalize()
+    name = email.partition("@")[0].partition(".")[0]
+    return name.capitalize()
 
 
 __all__ = [
@@ -5,18 +5,26 @@ All business logic lives here — views stay thin.
 Each function takes explicit arguments; no request objects passed in.
 """
 
+import uuid
+
 from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.core.cache import cache
 from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
 from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.crypto import salted_hmac
 from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import gettext as _
 
-from apps.core.models import Country, Language, Timezone
+from apps.core.models import Country, Timezone
+from apps.core.selectors import language_ids_by_code, timezone_ids_by_name
 from apps.tenants.models import Tenant
 from apps.users.models import User, UserProfile, derive_display_name
+from apps.users.tasks import enqueue_invite_emails
 
 # ---------------------------------------------------------------------------
 # Invite token
@@ -47,37 +55,60 @@ def make_invite_link(user: User, base_url: str) -> str:
     return f"{base_url}/invite/accept/{uid}/{token}/"
 
 
+def decode_invite_uid(uidb64: str) -> uuid.UUID | None:
+    """
+    Decode the user id from an invite link, or None if it is not a UUID.
+
+    Pure parsing — garbage links (scanner traffic, mangled URLs) are rejected
+    without touching the database.
+    """
+    try:
+        return uuid.UUID(force_str(urlsafe_base64_decode(uidb64)))
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
 def get_user_from_invite_link(uidb64: str, token: str) -> User | None:
     """
     Validate *uidb64* + *token* and return the User, or None if invalid/expired.
     """
-    try:
-        uid = force_str(urlsafe_base64_decode(uidb64))
-        user = User.objects.get(pk=uid)
-    except User.DoesNotExist, ValueError, TypeError, OverflowError:
+    uid = decode_invite_uid(uidb64)
+    if uid is None:
         return None
-    if invite_token_generator.check_token(user, token):
+    user = User.objects.filter(pk=uid).first()
+    if user is not None and invite_token_generator.check_token(user, token):
         return user
     return None
 
 
-def send_invite_email(user: User, admin_profile: UserProfile, base_url: str) -> None:
+def invite_email_context(
+    user: User, admin_profile: UserProfile, base_url: str
+) -> dict[str, str]:
     """
-    Send a workspace invitation email to *user*.
+    Everything the invitation email to *user* needs, as plain strings.
 
-    The email contains a signed link to /invite/accept/<uid>/<token>/ where
-    the invited user can set their password and complete their profile.
+    Reads ``admin_profile.tenant`` and ``admin_profile.user``; pass a profile
+    with both already loaded (``request.user.profile`` is, via
+    ProfileModelBackend) to build it without queries.
     """
     from django.conf import settings as django_settings
 
-    link = make_invite_link(user, base_url)
-    context = {
-        "invite_link": link,
+    return {
+        "invite_link": make_invite_link(user, base_url),
         "organisation": admin_profile.tenant.organization,
         "inviter_name": admin_profile.display_name or admin_profile.user.email,
         "invitee_email": user.email,
         "site_name": getattr(django_settings, "SITE_NAME", "SaaS App"),
     }
+
+
+def deliver_invite_email(context: dict[str, str], connection=None) -> None:
+    """
+    Render and send an invitation email from an ``invite_email_context``.
+
+    Touches no models, so it is safe to call off the request thread. An open
+    mail *connection* may be passed in to reuse it across several invites.
+    """
     subject = render_to_string("users/email/invite_subject.txt", context).strip()
     body_txt = render_to_string("users/email/invite.txt", context)
     body_html = render_to_string("users/email/invite.html", context)
@@ -85,9 +116,25 @@ def send_invite_email(user: User, admin_profile: UserProfile, base_url: str) ->
         subject=subject,
         message=body_txt,
         from_email=None,  # uses DEFAULT_FROM_EMAIL from settings
-        recipient_list=[user.email],
+        recipient_list=[context["invitee_email"]],
         html_message=body_html,
         fail_silently=False,
+        connection=connection,
+    )
+
+
+def send_invite_email(
+    user: User, admin_profile: UserProfile, base_url: str, connection=None
+) -> None:
+    """
+    Send a workspace invitation email to *user*.
+
+    The email contains a signed link to /invite/accept/<uid>/<token>/ where
+    the invited user can set their password and complete their profile.
+    See ``invite_email_context`` for what *admin_profile* must have loaded.
+    """
+    deliver_invite_email(
+        invite_email_context(user, admin_profile, base_url), connection=connection
     )
 
 
@@ -133,42 +180,79 @@ def register_user(
     """
     Create a new User and return it.
 
-    The UserProfile is created automatically by the post_save signal.
-    After creation we attempt to pre-fill timezone and language from
-    the browser-detected values if they match records in the DB.
-    """
-    user = User.objects.create_user(email=email.lower(), password=password)
+    The UserProfile is created automatically by the post_save signal, with
+    display_name derived from the email. Timezone and language are then
+    pre-filled from the browser-detected values if they match reference rows
+    — resolved from the cached reference maps and written in one UPDATE,
+    without loading the profile.
 
-    # Pre-fill display_name (signal may already do this — be idempotent)
-    profile: UserProfile = user.profile
-    if not profile.display_name:
-        profile.display_name = derive_display_name(email)
+    Raises ValueError if an account with this email already exists; the
+    unique constraint on User.email is the single source of truth.
+    """
+    updates: dict[str, int] = {}
 
     # Pre-fill timezone from browser hint
     if tz_detect:
-        tz_obj = Timezone.objects.filter(name=tz_detect).first()
-        if tz_obj:
-            profile.timezone = tz_obj
+        if tz_id := timezone_ids_by_name().get(tz_detect):
+            updates["timezone_id"] = tz_id
 
     # Pre-fill language from browser hint (e.g. "en-US" → try "en" or "en-US")
     if lang_detect:
         lang_code = lang_detect.lower().replace("-", "_")
+        languages = language_ids_by_code()
         # Try exact match first, then prefix
-        lang_obj = Language.objects.filter(code__iexact=lang_code).first()
-        if not lang_obj and "_" in lang_code:
-            lang_obj = Language.objects.filter(
-                code__iexact=lang_code.split("_")[0]
-            ).first()
-        if lang_obj:
-            profile.language = lang_obj
-
-    profile.save(update_fields=["display_name", "timezone", "language"])
+        lang_id = languages.get(lang_code) or languages.get(lang_code.split("_")[0])
+        if lang_id:
+            updates["language_id"] = lang_id
+
+    # User, signal-created profile and pre-fill commit together. Only a
+    # duplicate email becomes the ValueError; any other integrity failure
+    # (the signal's profile INSERT, a stale reference pk in the pre-fill)
+    # propagates as-is.
+    email = email.lower()
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(email=email, password=password)
+        except IntegrityError:
+            if User.objects.filter(email=email).exists():
+                raise ValueError(
+                    _("An account with this email already exists.")
+                ) from None
+            raise
+        if updates:
+            UserProfile.objects.filter(user_id=user.pk).update(**updates)
     return user
 
 
+_FAILED_LOGIN_TTL = 10  # seconds
+_FAILED_LOGIN_KEY = "auth:failed:{digest}"
+
+
+def _failed_login_key(email: str, password: str) -> str:
+    # Keyed HMAC of the pair — the attempted password never reaches the cache.
+    digest = salted_hmac(
+        "apps.users.failed_login", f"{email}\0{password}", algorithm="sha256"
+    ).hexdigest()
+    return _FAILED_LOGIN_KEY.format(digest=digest)
+
+
 def authenticate_user(email: str, password: str) -> User | None:
-    """Authenticate by email + password. Returns User or None."""
-    return authenticate(email=email.lower(), password=password)
+    """
+    Authenticate by email + password. Returns User or None.
+
+    A credential pair that just failed is remembered for 10 s, so a bot
+    replaying it gets None straight away instead of costing a full password
+    hash per request. Any other pair is checked as usual.
+    """
+    email = email.lower()
+    key = _failed_login_key(email, password)
+    if cache.get(key):
+        return None
+    user = authenticate(email=email, password=password)
+    if user is None:
+        cache.set(key, True, _FAILED_LOGIN_TTL)
+    return user
 
 
 # ---------------------------------------------------------------------------
@@ -204,15 +288,17 @@ def complete_profile(
     )
 
 
+@transaction.atomic
 def create_tenant_for_profile(profile: UserProfile, organization: str) -> Tenant:
     """
     Create a Tenant and assign it to the profile as admin.
 
-    Step 2 of onboarding.
+    Step 2 of onboarding. Both writes commit together, so a failed profile
+    update never leaves an orphan tenant behind.
     """
     tenant = Tenant.objects.create(
         organization=organization,
-        created_by=profile.user.pk,
+        created_by=profile.user_id,
     )
     profile.tenant = tenant
     profile.role = "admin"
@@ -226,6 +312,7 @@ def create_tenant_for_profile(profile: UserProfile, organization: str) -> Tenant
 # ---------------------------------------------------------------------------
 
 
+@transaction.atomic
 def invite_member(
     admin_profile: UserProfile, email: str, base_url: str = ""
 ) -> UserProfile:
@@ -236,22 +323,23 @@ def invite_member(
       (they must use the invite link to set their password).
     - The invited user's profile must have tenant=None (no second workspace).
     - Sets profile.tenant, role=member, tenant_joined_at=now(), is_active=True.
-    - Sends an invitation email with a signed accept link (when base_url is given).
+    - Sends an invitation email with a signed accept link (when base_url is
+      given) in the background, once the invite is committed.
     - Raises ValueError on constraint violations.
+    - All writes commit together (the email goes out only after the commit).
     """
     if not admin_profile.tenant:
         raise ValueError(_("Admin has no tenant to invite to."))
 
     email = email.lower()
 
-    # Get-or-create the user
-    user, created = User.objects.get_or_create(
+    # Get-or-create the user. A new user gets an unusable password as part of
+    # the INSERT rather than a follow-up UPDATE. An existing user's profile is
+    # joined into the lookup; a new user's profile is cached by the signal.
+    user, _created = User.objects.select_related("profile").get_or_create(
         email=email,
-        defaults={},
+        defaults={"password": make_password(None)},
     )
-    if created:
-        user.set_unusable_password()
-        user.save(update_fields=["password"])
 
     member_profile: UserProfile = user.profile
 
@@ -284,17 +372,87 @@ def invite_member(
         ]
     )
 
-    # Send the invitation email if a base_url was supplied.
+    # Send the invitation email (in the background) if a base_url was supplied.
     if base_url:
-        send_invite_email(
-            user=user,
-            admin_profile=admin_profile,
-            base_url=base_url,
-        )
+        enqueue_invite_emails([user], admin_profile, base_url)
 
     return member_profile
 
 
+def invite_members(
+    admin_profile: UserProfile, emails: list[str], base_url: str = ""
+) -> list[UserProfile]:
+    """
+    Invite many users to the admin's tenant at once (e.g. a CSV import).
+
+    Same rules as invite_member(), applied all-or-nothing: if any address
+    already belongs to a workspace, ValueError is raised and nobody is
+    invited. Runs a constant number of queries however long the list is —
+    missing users and their profiles are bulk-created, and every profile is
+    attached to the tenant in a single UPDATE. Invitation emails (when
+    base_url is given) go out in the background over one mail connection.
+    """
+    if not admin_profile.tenant:
+        raise ValueError(_("Admin has no tenant to invite to."))
+
+    emails = list(dict.fromkeys(email.lower() for email in emails))
+    if not emails:
+        return []
+
+    with transaction.atomic():
+        taken = (
+            UserProfile.objects.filter(user__email__in=emails, tenant__isnull=False)
+            .values_list("user__email", flat=True)
+            .first()
+        )
+        if taken is not None:
+            raise ValueError(
+                _(
+                    "%(email)s already belongs to a workspace. "
+                    "They must register a new account to join yours."
+                )
+                % {"email": taken}
+            )
+
+        # bulk_create skips the post_save signal, so profiles are created here.
+        existing = set(
+            User.objects.filter(email__in=emails).values_list("email", flat=True)
+        )
+        new_users = User.objects.bulk_create(
+            [
+                User(email=email, password=make_password(None))
+                for email in emails
+                if email not in existing
+            ],
+            batch_size=500,
+        )
+        UserProfile.objects.bulk_create(
+            [
+                UserProfile(user=user, display_name=derive_display_name(user.email))
+                for user in new_users
+            ],
+            batch_size=500,
+        )
+
+        UserProfile.objects.filter(user__email__in=emails).update(
+            tenant=admin_profile.tenant,
+            role="member",
+            tenant_joined_at=timezone.now(),
+            tenant_revoked_at=None,
+            is_active=True,
+            deleted_by=None,
+            deleted_at=None,
+        )
+        profiles = list(
+            UserProfile.objects.filter(user__email__in=emails).select_related("user")
+        )
+
+    if base_url:
+        enqueue_invite_emails([p.user for p in profiles], admin_profile, base_url)
+
+    return profiles
+
+
 def revoke_member(admin_profile: UserProfile, target_profile: UserProfile) -> None:
     """
     Revoke a member's access to the tenant.
@@ -310,7 +468,7 @@ def revoke_member(admin_profile: UserProfile, target_profile: UserProfile) -> No
 
     target_profile.is_active = False
     target_profile.tenant_revoked_at = timezone.now()
-    target_profile.deleted_by = admin_profile.user.pk
+    target_profile.deleted_by = admin_profile.user_id
     target_profile.save(update_fields=["is_active", "tenant_revoked_at", "deleted_by"])
 
 
@@ -343,7 +501,7 @@ def promote_to_admin(admin_profile: UserProfile, target_profile: UserProfile) ->
     if target_profile.role == "admin":
         return  # already admin — idempotent
     target_profile.role = "admin"
-    target_profile.updated_by = admin_profile.user.pk
+    target_profile.updated_by = admin_profile.user_id
     target_profile.save(update_fields=["role", "updated_by"])
 
 
@@ -369,7 +527,7 @@ def set_member_role(
     if target_profile.role == role:
         return  # already the requested role — idempotent
     target_profile.role = role
-    target_profile.updated_by = admin_profile.user.pk
+    target_profile.updated_by = admin_profile.user_id
     target_profile.save(update_fields=["role", "updated_by"])
 
 
@@ -392,12 +550,16 @@ __all__ = [
     "complete_profile",
     "create_tenant_for_profile",
     "invite_member",
+    "invite_members",
     "revoke_member",
     "reengage_member",
     "promote_to_admin",
     "set_member_role",
     "deactivate_member",
     "invite_token_generator",
+    "decode_invite_uid",
     "get_user_from_invite_link",
     "send_invite_email",
+    "invite_email_context",
+    "deliver_invite_email",
 ]
@@ -14,9 +14,13 @@ from .models import UserProfile, derive_display_name
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created: bool, **kwargs) -> None:
-    """Create a UserProfile for every new User. Idempotent via get_or_create."""
+    """
+    Create a UserProfile for every new User.
+
+    A user row that was just inserted cannot have a profile yet, so this is a
+    plain INSERT — no get_or_create SELECT + savepoint round trips.
+    """
     if created:
-        UserProfile.objects.get_or_create(
-            user=instance,
-            defaults={"display_name": derive_display_name(instance.email)},
+        UserProfile.objects.create(
+            user=instance, display_name=derive_display_name(instance.email)
         )
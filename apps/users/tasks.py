@@ -0,0 +1,62 @@
+"""
+Background work for the users app.
+
+There is no task queue yet (Celery arrives with billing — see AGENTS.md), so
+jobs run on a small in-process thread pool. Each job is handed to the pool
+only once the surrounding transaction commits, and must not touch the
+database: everything a job needs is resolved to plain values in the request
+thread before it is handed over.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import translation
+
+from apps.users.models import User, UserProfile
+
+logger = logging.getLogger(__name__)
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mail")
+
+
+def _send_invite_emails(contexts: list[dict[str, str]], language: str) -> None:
+    from apps.users.services import deliver_invite_email
+
+    try:
+        with translation.override(language), get_connection() as connection:
+            for context in contexts:
+                deliver_invite_email(context, connection=connection)
+    except Exception:
+        logger.exception("Sending invitation emails to %d users failed", len(contexts))
+
+
+def enqueue_invite_emails(
+    users: list[User], admin_profile: UserProfile, base_url: str
+) -> None:
+    """
+    Send invitation emails to *users* off the request path.
+
+    The SMTP round trips happen on a worker thread, over one shared mail
+    connection, after the surrounding transaction commits — the inviting
+    request returns without waiting for them, and nothing is sent for an
+    invite that was rolled back.
+
+    The links, names and addresses are resolved here, in the request thread
+    (see ``invite_email_context``), so the worker never opens a database
+    connection of its own. Worker threads have no active translation either,
+    so the inviting request's language is captured too and re-activated
+    around the sends.
+    """
+    from apps.users.services import invite_email_context
+
+    contexts = [invite_email_context(user, admin_profile, base_url) for user in users]
+    language = translation.get_language()
+    transaction.on_commit(
+        lambda: _EXECUTOR.submit(_send_invite_emails, contexts, language)
+    )
+
+
+__all__ = ["enqueue_invite_emails"]
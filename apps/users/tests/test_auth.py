@@ -2,11 +2,33 @@
 Phase 3 auth tests — login, register, logout, onboarding gate.
 """
 
-from django.test import TestCase
+from unittest.mock import patch
+
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.hashers import (
+    MD5PasswordHasher,
+    PBKDF2PasswordHasher,
+    check_password,
+    make_password,
+)
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
+from apps.core.models import Country, Language, Timezone
+from apps.core.selectors import clear_reference_caches
 from apps.tenants.models import Tenant
-from apps.users.models import User
+from apps.users.hashers import TunedPBKDF2PasswordHasher
+from apps.users.middleware import _is_exempt
+from apps.users.models import User, UserProfile
+from apps.users.services import (
+    authenticate_user,
+    create_tenant_for_profile,
+    register_user,
+)
 
 
 def _make_user(  # noqa: S107
@@ -17,34 +39,76 @@ def _make_user(  # noqa: S107
 ):
     """Helper: create a user and optionally complete their profile + attach tenant."""
     user = User.objects.create_user(email=email, password=password)
-    profile = user.profile
-    if complete:
-        from django.utils import timezone as tz
-
-        profile.profile_completed_at = tz.now()
-    if tenant:
-        profile.tenant = tenant
-        profile.role = "admin"
-        from django.utils import timezone as tz
-
-        profile.tenant_joined_at = tz.now()
-    profile.save()
+    if complete or tenant:
+        _complete_profile(user, tenant=tenant, completed=complete)
     return user
 
 
+def _complete_profile(user, tenant=None, completed=True, **fields):
+    """
+    Mark the user's profile complete and/or attach it to *tenant* as admin.
+
+    One UPDATE, no signals; the values are mirrored onto the cached
+    ``user.profile`` so callers don't need a refresh. Extra *fields*
+    (e.g. ``role``, ``is_active``) are written in the same statement.
+    """
+    now = timezone.now()
+    if completed:
+        fields.setdefault("profile_completed_at", now)
+    if tenant is not None:
+        fields = {"tenant": tenant, "role": "admin", "tenant_joined_at": now} | fields
+    UserProfile.objects.filter(user=user).update(**fields)
+    for name, value in fields.items():
+        setattr(user.profile, name, value)
+
+
 def _make_complete_user(email="complete@example.com", password="pass1234!"):  # noqa: S107
     """Create a fully onboarded user (profile complete + tenant)."""
     tenant = Tenant.objects.create(organization="ACME")
     return _make_user(email=email, password=password, complete=True, tenant=tenant)
 
 
-class LoginViewTest(TestCase):
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class AuthenticateUserTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="auth@example.com", password="pass1234!"
+        )
+
     def setUp(self):
-        self.url = reverse("users:login")
-        self.user = User.objects.create_user(
+        cache.clear()
+
+    @patch("apps.users.services.authenticate", return_value=None)
+    def test_repeated_failure_skips_password_check(self, mock_auth):
+        self.assertIsNone(authenticate_user("auth@example.com", "wrong"))
+        self.assertIsNone(authenticate_user("AUTH@example.com", "wrong"))
+        mock_auth.assert_called_once()
+
+    def test_other_password_is_still_checked(self):
+        self.assertIsNone(authenticate_user("auth@example.com", "wrong"))
+        self.assertEqual(authenticate_user("auth@example.com", "pass1234!"), self.user)
+
+    @patch("apps.users.services.authenticate")
+    def test_success_is_not_cached(self, mock_auth):
+        mock_auth.return_value = self.user
+        authenticate_user("auth@example.com", "pass1234!")
+        authenticate_user("auth@example.com", "pass1234!")
+        self.assertEqual(mock_auth.call_count, 2)
+
+
+class LoginViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             email="login@example.com", password="pass1234!"
         )
 
+    def setUp(self):
+        self.url = reverse("users:login")
+
     def test_get_renders_login_form(self):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
@@ -52,15 +116,7 @@ class LoginViewTest(TestCase):
 
     def test_correct_credentials_redirect_to_dashboard(self):
         # Complete the user so middleware passes
-        tenant = Tenant.objects.create(organization="T")
-        from django.utils import timezone as tz
-
-        p = self.user.profile
-        p.profile_completed_at = tz.now()
-        p.tenant = tenant
-        p.role = "admin"
-        p.tenant_joined_at = tz.now()
-        p.save()
+        _complete_profile(self.user, Tenant.objects.create(organization="T"))
         response = self.client.post(
             self.url, {"email": "login@example.com", "password": "pass1234!"}
         )
@@ -82,20 +138,36 @@ class LoginViewTest(TestCase):
         # 200 means no redirect happened
         self.assertEqual(response.status_code, 200)
 
+    def test_failed_login_hashes_once(self):
+        """A single backend: a failed login pays for one password check."""
+        for email in ("login@example.com", "nobody@example.com"):
+            with (
+                self.subTest(email=email),
+                patch.object(
+                    MD5PasswordHasher,
+                    "verify",
+                    autospec=True,
+                    side_effect=MD5PasswordHasher.verify,
+                ) as verify,
+                patch.object(
+                    MD5PasswordHasher,
+                    "encode",
+                    autospec=True,
+                    side_effect=MD5PasswordHasher.encode,
+                ) as encode,
+            ):
+                self.client.post(self.url, {"email": email, "password": "wrong"})
+                # Known email: one verify (which encodes once itself).
+                # Unknown email: one dummy encode, no verify.
+                self.assertLessEqual(verify.call_count, 1)
+                self.assertEqual(encode.call_count, 1)
+
     def test_cancel_link_points_to_homepage(self):
         response = self.client.get(self.url)
         self.assertContains(response, reverse("pages:home"))
 
     def test_next_param_redirects_after_login(self):
-        tenant = Tenant.objects.create(organization="T2")
-        from django.utils import timezone as tz
-
-        p = self.user.profile
-        p.profile_completed_at = tz.now()
-        p.tenant = tenant
-        p.role = "admin"
-        p.tenant_joined_at = tz.now()
-        p.save()
+        _complete_profile(self.user, Tenant.objects.create(organization="T2"))
         response = self.client.post(
             self.url + "?next=/dashboard/",
             {
@@ -140,6 +212,69 @@ class RegisterViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "already exists")
 
+    def test_duplicate_email_is_case_insensitive(self):
+        User.objects.create_user(email="dup@example.com", password="pass1234!")
+        response = self.client.post(
+            self.url, {"email": "DUP@Example.com", "password": "StrongPass1!"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "already exists")
+        self.assertEqual(User.objects.filter(email="dup@example.com").count(), 1)
+
+    def test_failed_profile_insert_is_not_reported_as_duplicate(self):
+        with (
+            patch(
+                "apps.users.signals.UserProfile.objects.create",
+                side_effect=IntegrityError("profile"),
+            ),
+            self.assertRaisesMessage(IntegrityError, "profile"),
+        ):
+            register_user(email="solo@example.com", password="StrongPass1!")
+        self.assertFalse(User.objects.filter(email="solo@example.com").exists())
+
+    def test_failed_prefill_is_not_reported_as_duplicate(self):
+        self.addCleanup(clear_reference_caches)
+        Timezone.objects.create(name="Europe/Brussels", label="Brussels")
+        with (
+            patch.object(
+                UserProfile.objects, "filter", side_effect=IntegrityError("prefill")
+            ),
+            self.assertRaisesMessage(IntegrityError, "prefill"),
+        ):
+            register_user(
+                email="hint@example.com",
+                password="StrongPass1!",
+                tz_detect="Europe/Brussels",
+            )
+        self.assertFalse(User.objects.filter(email="hint@example.com").exists())
+
+    def test_browser_hints_prefill_profile(self):
+        # The rows below vanish on rollback without a signal — drop the cache.
+        self.addCleanup(clear_reference_caches)
+        tz = Timezone.objects.create(name="Europe/Brussels", label="Brussels")
+        nl = Language.objects.create(code="nl", name="Dutch")
+        self.client.post(
+            self.url,
+            {
+                "email": "hinted@example.com",
+                "password": "StrongPass1!",
+                "lang_detect": "nl-BE",
+                "tz_detect": "Europe/Brussels",
+            },
+        )
+        profile = User.objects.get(email="hinted@example.com").profile
+        self.assertEqual(profile.timezone, tz)
+        self.assertEqual(profile.language, nl)
+
+    def test_registration_without_hints_leaves_profile_alone(self):
+        with CaptureQueriesContext(connection) as ctx:
+            register_user(email="plain@example.com", password="StrongPass1!")
+        self.assertFalse(
+            [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        )
+        profile = User.objects.get(email="plain@example.com").profile
+        self.assertEqual(profile.display_name, "Plain")
+
     def test_tz_detect_hidden_field_present(self):
         response = self.client.get(self.url)
         self.assertContains(response, 'name="tz_detect"')
@@ -188,9 +323,12 @@ class RegisterViewTest(TestCase):
 
 
 class LogoutViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = _make_complete_user()
+
     def setUp(self):
         self.url = reverse("users:logout")
-        self.user = _make_complete_user()
 
     def test_post_logout_redirects_to_home(self):
         self.client.force_login(self.user)
@@ -206,12 +344,15 @@ class LogoutViewTest(TestCase):
 
 
 class ProfileCompleteViewTest(TestCase):
-    def setUp(self):
-        self.url = reverse("users:profile_complete")
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             email="pc@example.com", password="pass1234!"
         )
 
+    def setUp(self):
+        self.url = reverse("users:profile_complete")
+
     def test_unauthenticated_redirects_to_login(self):
         response = self.client.get(self.url)
         self.assertRedirects(
@@ -229,6 +370,15 @@ class ProfileCompleteViewTest(TestCase):
         response = self.client.get(self.url)
         self.assertContains(response, "Complete your profile")
 
+    def test_browser_country_hint_prefills_country(self):
+        be = Country.objects.create(code="BE", code3="BEL", name="Belgium")
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["country_detect"] = "be"
+        session.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["form"].initial["country"], be.pk)
+
     def test_skip_sets_session_flag_and_redirects_to_step2(self):
         self.client.force_login(self.user)
         response = self.client.post(self.url, {"skip": "1"})
@@ -263,16 +413,15 @@ class ProfileCompleteViewTest(TestCase):
 
 
 class OnboardingTenantViewTest(TestCase):
-    def setUp(self):
-        self.url = reverse("users:onboarding_create_tenant")
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             email="ot@example.com", password="pass1234!"
         )
-        from django.utils import timezone as tz
+        _complete_profile(cls.user)
 
-        p = self.user.profile
-        p.profile_completed_at = tz.now()
-        p.save()
+    def setUp(self):
+        self.url = reverse("users:onboarding_create_tenant")
 
     def test_unauthenticated_redirects_to_login(self):
         response = self.client.get(self.url)
@@ -301,15 +450,18 @@ class OnboardingTenantViewTest(TestCase):
         self.assertIsNotNone(self.user.profile.tenant_id)
         self.assertEqual(self.user.profile.role, "admin")
 
+    def test_failed_profile_update_leaves_no_tenant(self):
+        profile = self.user.profile
+        with (
+            patch.object(profile, "save", side_effect=DatabaseError),
+            self.assertRaises(DatabaseError),
+        ):
+            create_tenant_for_profile(profile, "Orphan Corp")
+        self.assertFalse(Tenant.objects.filter(organization="Orphan Corp").exists())
+
     def test_user_with_tenant_redirected_to_dashboard(self):
         tenant = Tenant.objects.create(organization="Existing")
-        from django.utils import timezone as tz
-
-        p = self.user.profile
-        p.tenant = tenant
-        p.role = "admin"
-        p.tenant_joined_at = tz.now()
-        p.save()
+        _complete_profile(self.user, tenant, completed=False)
         self.client.force_login(self.user)
         response = self.client.get(self.url)
         self.assertRedirects(response, "/dashboard/", fetch_redirect_response=False)
@@ -329,12 +481,8 @@ class ProfileGateMiddlewareTest(TestCase):
         )
 
     def test_profile_complete_no_tenant_redirects_to_step2(self):
-        from django.utils import timezone as tz
-
         user = User.objects.create_user(email="gate2@example.com", password="pass1234!")
-        p = user.profile
-        p.profile_completed_at = tz.now()
-        p.save()
+        _complete_profile(user)
         self.client.force_login(user)
         response = self.client.get("/dashboard/")
         self.assertRedirects(
@@ -344,17 +492,9 @@ class ProfileGateMiddlewareTest(TestCase):
         )
 
     def test_revoked_user_redirected_to_account_revoked(self):
-        from django.utils import timezone as tz
-
         tenant = Tenant.objects.create(organization="R")
         user = User.objects.create_user(email="gate3@example.com", password="pass1234!")
-        p = user.profile
-        p.profile_completed_at = tz.now()
-        p.tenant = tenant
-        p.role = "member"
-        p.tenant_joined_at = tz.now()
-        p.is_active = False
-        p.save()
+        _complete_profile(user, tenant, role="member", is_active=False)
         self.client.force_login(user)
         response = self.client.get("/dashboard/")
         self.assertRedirects(
@@ -367,6 +507,29 @@ class ProfileGateMiddlewareTest(TestCase):
         response = self.client.get("/dashboard/")
         self.assertEqual(response.status_code, 200)
 
+    def test_revocation_applies_to_existing_session(self):
+        """The profile is re-read on every request — no stale gate decision."""
+        user = _make_complete_user(email="gate6@example.com")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get("/dashboard/").status_code, 200)
+        UserProfile.objects.filter(user=user).update(is_active=False)
+        response = self.client.get("/dashboard/")
+        self.assertRedirects(
+            response, "/account/revoked/", fetch_redirect_response=False
+        )
+
+    def test_session_from_stock_model_backend_stays_valid(self):
+        """Sessions created before ProfileModelBackend survive the deploy."""
+        user = _make_complete_user(email="gate7@example.com")
+        self.client.force_login(
+            user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        self.assertEqual(self.client.get("/dashboard/").status_code, 200)
+        self.assertEqual(
+            self.client.session[BACKEND_SESSION_KEY],
+            "apps.users.backends.ProfileModelBackend",
+        )
+
     def test_logout_never_intercepted(self):
         user = User.objects.create_user(email="gate5@example.com", password="pass1234!")
         self.client.force_login(user)
@@ -380,11 +543,40 @@ class ProfileGateMiddlewareTest(TestCase):
         response = self.client.get("/health/")
         self.assertEqual(response.status_code, 200)
 
+    def test_exempt_path_does_not_load_user(self):
+        """Exempt paths are checked before request.user is materialised."""
+        user = _make_complete_user(email="gate7@example.com")
+        self.client.force_login(user)
+        with self.assertNumQueries(0):
+            response = self.client.get("/health/")
+        self.assertEqual(response.status_code, 200)
+
+
+class ExemptPathTest(SimpleTestCase):
+    """_is_exempt: exact matches, built-in prefixes, and the settings list."""
+
+    def test_exact_urls_do_not_prefix_match(self):
+        self.assertTrue(_is_exempt("/logout/"))
+        self.assertFalse(_is_exempt("/logout/extra/"))
+
+    def test_admin_and_invite_prefixes(self):
+        self.assertTrue(_is_exempt("/admin/users/user/"))
+        self.assertTrue(_is_exempt("/invite/accept/abc/def/"))
+        self.assertFalse(_is_exempt("/dashboard/"))
+
+    @override_settings(PROFILE_GATE_EXEMPT_URLS=["/webhooks/"])
+    def test_settings_urls_prefix_match(self):
+        self.assertTrue(_is_exempt("/webhooks/stripe/"))
+        self.assertFalse(_is_exempt("/dashboard/"))
+
 
 class ProfileViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = _make_complete_user(email="pv@example.com")
+
     def setUp(self):
         self.url = reverse("users:profile")
-        self.user = _make_complete_user(email="pv@example.com")
 
     def test_renders_profile_template(self):
         self.client.force_login(self.user)
@@ -444,8 +636,9 @@ class SetThemeViewTest(TestCase):
 
     url = "/theme/set/"
 
-    def setUp(self):
-        self.user = _make_complete_user(email="theme@example.com")
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = _make_complete_user(email="theme@example.com")
 
     # --- authenticated ---
 
@@ -544,13 +737,14 @@ class LanguageCookieSyncTest(TestCase):
 
     LANG_COOKIE = "django_language"
 
-    def setUp(self):
-        from apps.tenants.models import Tenant
-
+    @classmethod
+    def setUpTestData(cls):
         tenant = Tenant.objects.create(organization="Test Corp")
-        self.user = _make_user(
+        cls.user = _make_user(
             email="langtest@example.com", complete=True, tenant=tenant
         )
+
+    def setUp(self):
         self.client.force_login(self.user)
 
     def test_set_language_nl_sets_cookie_nl_be(self):
@@ -605,3 +799,40 @@ class LanguageCookieSyncTest(TestCase):
         response = self.client.get(reverse("users:profile"))
         # "Wijzigingen opslaan" = "Save changes" in Dutch.
         self.assertContains(response, "Wijzigingen opslaan")
+
+
+_TUNED_HASHERS = ["apps.users.hashers.TunedPBKDF2PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=_TUNED_HASHERS)
+class TunedPBKDF2PasswordHasherTest(SimpleTestCase):
+    # Hashing tests lower Django's default (the floor) to keep them fast.
+
+    @patch.object(PBKDF2PasswordHasher, "iterations", 100)
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1_000)
+    def test_uses_configured_iterations(self):
+        encoded = make_password("pass1234!")
+        self.assertTrue(encoded.startswith("pbkdf2_sha256$1000$"))
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1_000)
+    def test_count_below_django_default_is_ignored(self):
+        self.assertEqual(
+            TunedPBKDF2PasswordHasher().iterations, PBKDF2PasswordHasher.iterations
+        )
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=None)
+    def test_unset_falls_back_to_django_default(self):
+        self.assertEqual(
+            TunedPBKDF2PasswordHasher().iterations, PBKDF2PasswordHasher.iterations
+        )
+
+    @patch.object(PBKDF2PasswordHasher, "iterations", 100)
+    def test_hash_with_other_iteration_count_is_upgraded(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1_000):
+            encoded = make_password("pass1234!")
+        upgraded = []
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2_000):
+            self.assertTrue(
+                check_password("pass1234!", encoded, setter=upgraded.append)
+            )
+        self.assertEqual(upgraded, ["pass1234!"])
@@ -0,0 +1,241 @@
+"""
+Tests for apps.users.geo — IP geolocation helpers.
+
+Covers:
+- lookup_from_ip() parses a successful ip-api.com answer
+- lookup_from_ip() caches successful answers per IP
+- lookup_from_ip() does not cache failures
+- lookup_from_ip() skips private addresses without a network call
+- prefetch_from_ip() hands public, uncached IPs to the background executor
+- _is_private() classifies addresses with the ipaddress module
+- get_client_ip() takes the first X-Forwarded-For hop
+- lookup_from_ips() batches uncached public IPs and reuses the cache
+- _api_call() reuses one keep-alive connection and reconnects when it goes stale
+"""
+
+import http.client
+import json
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.users import geo
+from apps.users.geo import (
+    get_client_ip,
+    lookup_from_ip,
+    lookup_from_ips,
+    prefetch_from_ip,
+)
+
+_LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _api_body(**data) -> bytes:
+    return json.dumps({"status": "success", **data}).encode()
+
+
+@override_settings(CACHES=_LOCMEM)
+class LookupFromIpTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    @patch("apps.users.geo._api_call")
+    def test_success_maps_fields(self, mock_get):
+        mock_get.return_value = _api_body(countryCode="BE", timezone="Europe/Brussels")
+        self.assertEqual(
+            lookup_from_ip("8.8.8.8"),
+            {"timezone": "Europe/Brussels", "country": "BE", "language": "nl-BE"},
+        )
+
+    @patch("apps.users.geo._api_call")
+    def test_repeat_lookup_is_served_from_cache(self, mock_get):
+        mock_get.return_value = _api_body(countryCode="FR")
+        first = lookup_from_ip("8.8.4.4")
+        second = lookup_from_ip("8.8.4.4")
+        self.assertEqual(first, second)
+        mock_get.assert_called_once()
+
+    @patch("apps.users.geo._api_call", side_effect=TimeoutError)
+    def test_failure_is_not_cached(self, mock_get):
+        self.assertEqual(lookup_from_ip("1.1.1.1"), {})
+        self.assertEqual(lookup_from_ip("1.1.1.1"), {})
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("apps.users.geo._api_call")
+    def test_private_ip_skips_network(self, mock_get):
+        self.assertEqual(lookup_from_ip("192.168.1.10"), {})
+        mock_get.assert_not_called()
+
+
+@override_settings(CACHES=_LOCMEM)
+@patch("apps.users.geo._EXECUTOR")
+class PrefetchFromIpTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_public_ip_is_submitted(self, mock_executor):
+        prefetch_from_ip("8.8.8.8")
+        mock_executor.submit.assert_called_once_with(lookup_from_ip, "8.8.8.8")
+
+    def test_private_ip_is_skipped(self, mock_executor):
+        prefetch_from_ip("127.0.0.1")
+        prefetch_from_ip("")
+        mock_executor.submit.assert_not_called()
+
+    def test_cached_ip_is_skipped(self, mock_executor):
+        cache.set("geo:ip:8.8.8.8", {"country": "US"})
+        prefetch_from_ip("8.8.8.8")
+        mock_executor.submit.assert_not_called()
+
+
+@override_settings(CACHES=_LOCMEM)
+class LookupFromIpsTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    @patch("apps.users.geo._api_call")
+    def test_batch_maps_answers_by_position(self, mock_call):
+        mock_call.return_value = json.dumps(
+            [
+                {"status": "success", "countryCode": "BE"},
+                {"status": "fail"},
+            ]
+        ).encode()
+        results = lookup_from_ips(["8.8.8.8", "10.0.0.1", "1.1.1.1"])
+        self.assertEqual(results["8.8.8.8"], {"country": "BE", "language": "nl-BE"})
+        self.assertEqual(results["10.0.0.1"], {})
+        self.assertEqual(results["1.1.1.1"], {})
+        mock_call.assert_called_once()
+        method, path, body = mock_call.call_args.args
+        self.assertEqual(method, "POST")
+        self.assertEqual(json.loads(body), ["8.8.8.8", "1.1.1.1"])
+
+    @patch("apps.users.geo._api_call")
+    def test_batch_reuses_single_lookup_cache(self, mock_call):
+        mock_call.return_value = _api_body(countryCode="FR")
+        lookup_from_ip("8.8.4.4")
+        mock_call.reset_mock()
+        results = lookup_from_ips(["8.8.4.4"])
+        self.assertEqual(results["8.8.4.4"]["country"], "FR")
+        mock_call.assert_not_called()
+
+    @patch("apps.users.geo._api_call")
+    def test_batches_are_capped_at_100(self, mock_call):
+        mock_call.side_effect = lambda method, path, body: json.dumps(
+            [{"status": "success"}] * len(json.loads(body))
+        ).encode()
+        lookup_from_ips([f"8.8.{i // 256}.{i % 256}" for i in range(250)])
+        self.assertEqual(mock_call.call_count, 3)
+
+    @patch("apps.users.geo._api_call")
+    def test_non_list_body_falls_back_to_empty(self, mock_call):
+        for body in ({"message": "rate limited"}, "error"):
+            with self.subTest(body=body):
+                mock_call.return_value = json.dumps(body).encode()
+                results = lookup_from_ips(["8.8.8.8", "1.1.1.1"])
+                self.assertEqual(results, {"8.8.8.8": {}, "1.1.1.1": {}})
+
+    @patch("apps.users.geo._api_call")
+    def test_non_dict_answer_is_skipped(self, mock_call):
+        mock_call.return_value = json.dumps(
+            ["oops", {"status": "success", "countryCode": "FR"}]
+        ).encode()
+        results = lookup_from_ips(["8.8.8.8", "1.1.1.1"])
+        self.assertEqual(results["8.8.8.8"], {})
+        self.assertEqual(results["1.1.1.1"]["country"], "FR")
+
+    @patch("apps.users.geo._api_call")
+    def test_short_response_is_logged(self, mock_call):
+        mock_call.return_value = json.dumps([{"status": "success"}]).encode()
+        with self.assertLogs("apps.users.geo", level="WARNING"):
+            results = lookup_from_ips(["8.8.8.8", "1.1.1.1"])
+        self.assertEqual(results["1.1.1.1"], {})
+
+    @patch("apps.users.geo._api_call", return_value=b'"error"')
+    def test_single_lookup_non_object_body_is_empty(self, mock_call):
+        self.assertEqual(lookup_from_ip("8.8.8.8"), {})
+
+
+class IsPrivateTest(SimpleTestCase):
+    def test_private_ranges(self):
+        for ip in (
+            "127.0.0.1",
+            "10.1.2.3",
+            "172.16.0.1",
+            "172.25.9.9",
+            "172.31.255.255",
+            "192.168.0.1",
+            "169.254.1.1",
+            "::1",
+            "fd00::1",
+            "fe80::1",
+        ):
+            with self.subTest(ip=ip):
+                self.assertTrue(geo._is_private(ip))
+
+    def test_public_addresses(self):
+        for ip in ("8.8.8.8", "172.32.0.1", "172.200.1.1", "2001:4860:4860::8888"):
+            with self.subTest(ip=ip):
+                self.assertFalse(geo._is_private(ip))
+
+    def test_non_ip_is_private(self):
+        self.assertTrue(geo._is_private("localhost"))
+        self.assertTrue(geo._is_private("not-an-ip"))
+
+
+class GetClientIpTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_first_forwarded_hop_wins(self):
+        request = self.factory.get(
+            "/", HTTP_X_FORWARDED_FOR=" 203.0.113.7 , 10.0.0.1, 10.0.0.2"
+        )
+        self.assertEqual(get_client_ip(request), "203.0.113.7")
+
+    def test_single_forwarded_hop(self):
+        request = self.factory.get("/", HTTP_X_FORWARDED_FOR="203.0.113.7")
+        self.assertEqual(get_client_ip(request), "203.0.113.7")
+
+    def test_falls_back_to_remote_addr(self):
+        request = self.factory.get("/", REMOTE_ADDR="198.51.100.1")
+        self.assertEqual(get_client_ip(request), "198.51.100.1")
+
+
+class ApiConnectionTest(SimpleTestCase):
+    def setUp(self):
+        geo._local.conn = None
+        self.addCleanup(setattr, geo._local, "conn", None)
+
+    def _conn(self):
+        conn = MagicMock()
+        conn.getresponse.return_value.status = 200
+        conn.getresponse.return_value.read.return_value = b"{}"
+        return conn
+
+    def test_connection_is_reused(self):
+        conn = self._conn()
+        with patch("http.client.HTTPConnection", return_value=conn) as factory:
+            geo._api_call("GET", "/a")
+            geo._api_call("GET", "/b")
+        factory.assert_called_once()
+        self.assertEqual(conn.request.call_count, 2)
+
+    def test_stale_connection_is_replaced(self):
+        stale, fresh = self._conn(), self._conn()
+        stale.getresponse.side_effect = http.client.RemoteDisconnected
+        geo._local.conn = stale
+        with patch("http.client.HTTPConnection", return_value=fresh):
+            self.assertEqual(geo._api_call("GET", "/a"), b"{}")
+        stale.close.assert_called_once()
+        self.assertIs(geo._local.conn, fresh)
+
+    def test_timeout_is_not_retried(self):
+        conn = self._conn()
+        conn.getresponse.side_effect = TimeoutError
+        with patch("http.client.HTTPConnection", return_value=conn) as factory:
+            with self.assertRaises(TimeoutError):
+                geo._api_call("GET", "/a")
+        factory.assert_called_once()
+        self.assertIsNone(geo._local.conn)
@@ -8,7 +8,7 @@ Verifies that:
 - The nl-BE → nl fallback chain works (nl_BE overrides layer on top of base nl).
 """
 
-from django.test import TestCase, override_settings
+from django.test import SimpleTestCase, override_settings
 from django.urls import reverse
 
 
@@ -17,7 +17,7 @@ from django.urls import reverse
     LANGUAGES=[("en", "English"), ("nl-be", "Nederlands"), ("fr-be", "Français")],
     USE_I18N=True,
 )
-class I18NLanguageTests(TestCase):
+class I18NLanguageTests(SimpleTestCase):
     """Test that pages are served in the correct language."""
 
     def test_english_is_default(self):
@@ -73,7 +73,7 @@ class I18NLanguageTests(TestCase):
     LANGUAGES=[("en", "English"), ("nl-be", "Nederlands"), ("fr-be", "Français")],
     USE_I18N=True,
 )
-class SetLanguageViewTests(TestCase):
+class SetLanguageViewTests(SimpleTestCase):
     """Test Django's built-in set_language view switches the session language."""
 
     def test_set_language_to_dutch(self):
@@ -3,25 +3,40 @@ Tests for the invite-email accept flow.
 
 Covers:
 - invite_member() sends an email when base_url is provided
+- invite_member() hands the email to the background executor only on commit
+- invite_member() creates new invitees with an unusable password
+- send_invite_email() issues no queries for a pre-joined admin profile
+- the background email job issues no queries, even for a plain admin profile
 - GET /invite/accept/<uidb64>/<token>/ — valid token renders form
 - POST — sets password, stamps profile_completed_at, logs in, redirects to profile
 - POST — user is authenticated after accepting
 - GET — invalid/garbage token returns 400
+- get_user_from_invite_link() rejects non-UUID uids without a query
 - GET — expired token returns 400
 - GET — already-accepted (user has usable password) returns 200 + already_accepted page
 """
 
+import threading
 from unittest.mock import patch
 
+from django.core import mail
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from django.utils import timezone
+from django.utils import timezone, translation
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
 from apps.tenants.models import Tenant
-from apps.users.models import User
-from apps.users.services import invite_member, invite_token_generator
+from apps.users.models import User, UserProfile
+from apps.users.services import (
+    get_user_from_invite_link,
+    invite_member,
+    invite_token_generator,
+    send_invite_email,
+)
+from apps.users.tasks import enqueue_invite_emails
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -69,18 +84,31 @@ def _accept_url(user):
 # ---------------------------------------------------------------------------
 
 
+def _run_inline(fn, *args):
+    """Stand-in for the background executor: run the job immediately."""
+    return fn(*args)
+
+
 class InviteMemberEmailTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+
     def setUp(self):
-        self.admin, self.tenant = _make_admin()
+        patcher = patch("apps.users.tasks._EXECUTOR.submit", side_effect=_run_inline)
+        self.mock_submit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _invite(self, email, base_url="https://example.com"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return invite_member(
+                admin_profile=self.admin.profile, email=email, base_url=base_url
+            )
 
     @patch("apps.users.services.send_mail")
     def test_invite_sends_email_when_base_url_given(self, mock_send):
         """invite_member() calls send_mail once when base_url is provided."""
-        invite_member(
-            admin_profile=self.admin.profile,
-            email="newbie@example.com",
-            base_url="https://example.com",
-        )
+        self._invite("newbie@example.com")
         mock_send.assert_called_once()
         call_kwargs = mock_send.call_args
         # recipient should be the invited email
@@ -88,28 +116,101 @@ class InviteMemberEmailTest(TestCase):
         recipients = kw.get("recipient_list") or call_kwargs[0][3]
         self.assertIn("newbie@example.com", recipients)
 
+    def test_new_invitee_has_unusable_password(self):
+        """A newly created invitee cannot log in until they accept the invite."""
+        profile = invite_member(
+            admin_profile=self.admin.profile, email="Fresh@Example.com"
+        )
+        self.assertEqual(profile.user.email, "fresh@example.com")
+        self.assertFalse(profile.user.has_usable_password())
+        self.assertEqual(profile.tenant, self.tenant)
+
+    def test_invite_loads_existing_user_and_profile_together(self):
+        User.objects.create_user(email="known@example.com", password="pass1234!")
+        with CaptureQueriesContext(connection) as ctx:
+            invite_member(admin_profile=self.admin.profile, email="known@example.com")
+        selects = [q for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+
     @patch("apps.users.services.send_mail")
     def test_invite_no_email_without_base_url(self, mock_send):
         """invite_member() does NOT call send_mail when base_url is empty."""
-        invite_member(
-            admin_profile=self.admin.profile,
-            email="quiet@example.com",
-            base_url="",
-        )
+        self._invite("quiet@example.com", base_url="")
         mock_send.assert_not_called()
 
+    @patch("apps.users.services.send_mail")
+    def test_invite_email_waits_for_commit(self, mock_send):
+        """Nothing is handed to the background executor before the commit."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            invite_member(
+                admin_profile=self.admin.profile,
+                email="later@example.com",
+                base_url="https://example.com",
+            )
+            self.mock_submit.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        mock_send.assert_not_called()
+
+    @patch("apps.users.services.send_mail", side_effect=OSError("SMTP down"))
+    def test_invite_email_failure_is_logged(self, mock_send):
+        """A failed send is logged; the invite itself still stands."""
+        with self.assertLogs("apps.users.tasks", level="ERROR"):
+            profile = self._invite("unlucky@example.com")
+        self.assertEqual(profile.tenant, self.tenant)
+
+    def test_invite_email_uses_inviters_language(self):
+        """The worker thread renders in the language active when inviting."""
+
+        def run_on_fresh_thread(fn, *args):
+            # A new thread starts without an active translation, like the pool's.
+            worker = threading.Thread(target=fn, args=args)
+            worker.start()
+            worker.join()
+
+        self.mock_submit.side_effect = run_on_fresh_thread
+        with translation.override("nl-be"):
+            self._invite("dutch@example.com")
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(
+            message.subject, "U bent uitgenodigd om lid te worden van InviteCorp"
+        )
+        self.assertIn("heeft u uitgenodigd om lid te worden van", message.body)
+
     @patch("apps.users.services.send_mail")
     def test_invite_email_subject_contains_org(self, mock_send):
         """The email subject mentions the organisation name."""
-        invite_member(
-            admin_profile=self.admin.profile,
-            email="subject@example.com",
-            base_url="https://example.com",
-        )
+        self._invite("subject@example.com")
         kw = mock_send.call_args[1] or {}
         subject = kw.get("subject") or mock_send.call_args[0][0]
         self.assertIn("InviteCorp", subject)
 
+    @patch("apps.users.services.send_mail")
+    def test_send_invite_email_needs_no_queries(self, mock_send):
+        """With tenant + user joined up front, building the email is query-free."""
+        admin_profile = UserProfile.objects.select_related("tenant", "user").get(
+            user=self.admin
+        )
+        invitee = _make_invited_user(self.tenant)
+        with self.assertNumQueries(0):
+            send_invite_email(invitee, admin_profile, "https://example.com")
+        mock_send.assert_called_once()
+
+    @patch("apps.users.services.send_mail")
+    def test_background_job_needs_no_queries(self, mock_send):
+        """Tenant and inviter are resolved before the job reaches the pool."""
+        # Plain fetch, as a session from the stock ModelBackend would give.
+        admin_profile = UserProfile.objects.get(user=self.admin)
+        self.mock_submit.side_effect = None
+        invitee = _make_invited_user(self.tenant)
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_invite_emails([invitee], admin_profile, "https://example.com")
+        job, *args = self.mock_submit.call_args.args
+        with self.assertNumQueries(0):
+            job(*args)
+        mock_send.assert_called_once()
+        self.assertIn("InviteCorp", mock_send.call_args.kwargs["subject"])
+
 
 # ---------------------------------------------------------------------------
 # GET — valid token
@@ -117,10 +218,11 @@ class InviteMemberEmailTest(TestCase):
 
 
 class InviteAcceptGetValidTest(TestCase):
-    def setUp(self):
-        _, self.tenant = _make_admin()
-        self.user = _make_invited_user(self.tenant)
-        self.url = _accept_url(self.user)
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.tenant = _make_admin()
+        cls.user = _make_invited_user(cls.tenant)
+        cls.url = _accept_url(cls.user)
 
     def test_valid_token_returns_200(self):
         response = self.client.get(self.url)
@@ -141,10 +243,11 @@ class InviteAcceptGetValidTest(TestCase):
 
 
 class InviteAcceptPostTest(TestCase):
-    def setUp(self):
-        _, self.tenant = _make_admin()
-        self.user = _make_invited_user(self.tenant)
-        self.url = _accept_url(self.user)
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.tenant = _make_admin()
+        cls.user = _make_invited_user(cls.tenant)
+        cls.url = _accept_url(cls.user)
 
     def test_post_sets_usable_password(self):
         data = {"password": "newpass99!", "confirm_password": "newpass99!"}
@@ -196,9 +299,10 @@ class InviteAcceptPostTest(TestCase):
 
 
 class InviteAcceptInvalidTokenTest(TestCase):
-    def setUp(self):
-        _, self.tenant = _make_admin()
-        self.user = _make_invited_user(self.tenant)
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.tenant = _make_admin()
+        cls.user = _make_invited_user(cls.tenant)
 
     def test_garbage_token_returns_400(self):
         uid = urlsafe_base64_encode(force_bytes(self.user.pk))
@@ -219,6 +323,19 @@ class InviteAcceptInvalidTokenTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 400)
 
+    def test_non_uuid_uid_returns_400(self):
+        """A well-formed base64 uid that is not a UUID is rejected up front."""
+        token = invite_token_generator.make_token(self.user)
+        uid = urlsafe_base64_encode(b"hello")
+        self.assertIsNone(get_user_from_invite_link(uid, token))
+        url = reverse("users:invite_accept", kwargs={"uidb64": uid, "token": token})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_garbage_uid_skips_database(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_user_from_invite_link("notauid", "x-y"))
+
     def test_expired_token_returns_already_accepted(self):
         """
         Simulate a used/expired token by setting the user's password after
@@ -249,21 +366,22 @@ class InviteAcceptInvalidTokenTest(TestCase):
 
 
 class InviteAcceptAlreadyAcceptedTest(TestCase):
-    def setUp(self):
-        _, self.tenant = _make_admin()
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.tenant = _make_admin()
         # User who has already set a password (simulates re-visiting the link).
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             email="done@invite.com", password="alreadyset1!"
         )
-        p = self.user.profile
-        p.tenant = self.tenant
+        p = cls.user.profile
+        p.tenant = cls.tenant
         p.role = "member"
         p.tenant_joined_at = timezone.now()
         p.profile_completed_at = timezone.now()
         p.save()
-        uid = urlsafe_base64_encode(force_bytes(self.user.pk))
-        token = invite_token_generator.make_token(self.user)
-        self.url = reverse(
+        uid = urlsafe_base64_encode(force_bytes(cls.user.pk))
+        token = invite_token_generator.make_token(cls.user)
+        cls.url = reverse(
             "users:invite_accept",
             kwargs={"uidb64": uid, "token": token},
         )
@@ -285,10 +403,11 @@ class InviteAcceptAlreadyAcceptedTest(TestCase):
 class InviteAcceptAccessTest(TestCase):
     """Verify the invite URL is accessible without a session (public URL)."""
 
-    def setUp(self):
-        _, self.tenant = _make_admin()
-        self.user = _make_invited_user(self.tenant)
-        self.url = _accept_url(self.user)
+    @classmethod
+    def setUpTestData(cls):
+        _, cls.tenant = _make_admin()
+        cls.user = _make_invited_user(cls.tenant)
+        cls.url = _accept_url(cls.user)
 
     def test_unauthenticated_user_can_get_accept_url(self):
         """The accept URL must be reachable without being logged in."""
@@ -2,12 +2,18 @@
 Phase 3 member management tests.
 """
 
+from unittest.mock import patch
+
+from django.core import mail
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from apps.tenants.models import Tenant
-from apps.users.models import User
+from apps.users.models import User, UserProfile
+from apps.users.services import invite_members, revoke_member, set_member_role
 
 
 def _make_admin(email="admin@example.com"):
@@ -37,9 +43,10 @@ def _make_member(tenant, email="member@example.com", is_active=True):
 
 
 class MembersViewTest(TestCase):
-    def setUp(self):
-        self.admin_user, self.tenant = _make_admin()
-        self.url = reverse("users:members")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user, cls.tenant = _make_admin()
+        cls.url = reverse("users:members")
 
     def test_admin_can_access_members_page(self):
         self.client.force_login(self.admin_user)
@@ -71,9 +78,10 @@ class MembersViewTest(TestCase):
 
 
 class InviteMemberViewTest(TestCase):
-    def setUp(self):
-        self.admin_user, self.tenant = _make_admin()
-        self.url = reverse("users:invite_member")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user, cls.tenant = _make_admin()
+        cls.url = reverse("users:invite_member")
 
     def test_admin_can_invite_new_email(self):
         self.client.force_login(self.admin_user)
@@ -122,10 +130,95 @@ class InviteMemberViewTest(TestCase):
         self.assertEqual(response.status_code, 403)
 
 
+class InviteMembersServiceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user, cls.tenant = _make_admin()
+        cls.admin_profile = cls.admin_user.profile
+
+    def test_invites_new_and_existing_users(self):
+        User.objects.create_user(email="loose@example.com", password="pass1234!")
+        profiles = invite_members(
+            self.admin_profile,
+            ["New@Example.com", "loose@example.com", "new@example.com"],
+        )
+        self.assertEqual(
+            sorted(p.user.email for p in profiles),
+            ["loose@example.com", "new@example.com"],
+        )
+        for profile in profiles:
+            self.assertEqual(profile.tenant, self.tenant)
+            self.assertEqual(profile.role, "member")
+            self.assertIsNotNone(profile.tenant_joined_at)
+        new_user = User.objects.get(email="new@example.com")
+        self.assertFalse(new_user.has_usable_password())
+        self.assertEqual(new_user.profile.display_name, "New")
+
+    def test_member_of_another_workspace_aborts_the_batch(self):
+        other_tenant = Tenant.objects.create(organization="Other Corp")
+        _make_member(other_tenant, email="taken@example.com")
+        with self.assertRaises(ValueError):
+            invite_members(
+                self.admin_profile, ["fresh@example.com", "taken@example.com"]
+            )
+        self.assertFalse(User.objects.filter(email="fresh@example.com").exists())
+        self.assertEqual(
+            UserProfile.objects.get(user__email="taken@example.com").tenant,
+            other_tenant,
+        )
+
+    def test_query_count_does_not_grow_with_the_list(self):
+        def run(emails):
+            with CaptureQueriesContext(connection) as ctx:
+                invite_members(self.admin_profile, emails)
+            return len(ctx.captured_queries)
+
+        small = run([f"a{i}@example.com" for i in range(3)])
+        large = run([f"b{i}@example.com" for i in range(30)])
+        self.assertEqual(small, large)
+
+    @patch("apps.users.tasks._EXECUTOR.submit", side_effect=lambda fn, *a: fn(*a))
+    def test_sends_one_email_per_invitee(self, mock_submit):
+        with self.captureOnCommitCallbacks(execute=True):
+            invite_members(
+                self.admin_profile,
+                ["one@example.com", "two@example.com"],
+                base_url="https://example.com",
+            )
+        mock_submit.assert_called_once()
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            ["one@example.com", "two@example.com"],
+        )
+
+
+class MemberServiceQueryTest(TestCase):
+    """Role and access changes read the acting admin's id, not their User row."""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin_user, tenant = _make_admin()
+        member_user = _make_member(tenant)
+        # Plain fetches: neither profile has its user cached.
+        cls.admin_profile = UserProfile.objects.get(user=admin_user)
+        cls.target = UserProfile.objects.get(user=member_user)
+
+    def test_revoke_is_one_update(self):
+        with self.assertNumQueries(1):
+            revoke_member(self.admin_profile, self.target)
+        self.assertEqual(self.target.deleted_by, self.admin_profile.user_id)
+
+    def test_set_role_is_one_update(self):
+        with self.assertNumQueries(1):
+            set_member_role(self.admin_profile, self.target, "admin")
+        self.assertEqual(self.target.updated_by, self.admin_profile.user_id)
+
+
 class RevokeMemberViewTest(TestCase):
-    def setUp(self):
-        self.admin_user, self.tenant = _make_admin()
-        self.member_user = _make_member(self.tenant, email="target@example.com")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user, cls.tenant = _make_admin()
+        cls.member_user = _make_member(cls.tenant, email="target@example.com")
 
     def test_admin_can_revoke_member(self):
         url = reverse("users:revoke_member", args=[self.member_user.profile.pk])
@@ -165,13 +258,14 @@ class RevokeMemberViewTest(TestCase):
 
 
 class ReengageMemberViewTest(TestCase):
-    def setUp(self):
-        self.admin_user, self.tenant = _make_admin()
-        self.member_user = _make_member(
-            self.tenant, email="revoked@example.com", is_active=False
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user, cls.tenant = _make_admin()
+        cls.member_user = _make_member(
+            cls.tenant, email="revoked@example.com", is_active=False
         )
-        self.member_user.profile.tenant_revoked_at = timezone.now()
-        self.member_user.profile.save()
+        cls.member_user.profile.tenant_revoked_at = timezone.now()
+        cls.member_user.profile.save()
 
     def test_admin_can_reengage_revoked_member(self):
         url = reverse("users:reengage_member", args=[self.member_user.profile.pk])
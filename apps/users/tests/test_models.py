@@ -79,6 +79,11 @@ class UserProfileSignalTest(TestCase):
         self.assertEqual(user.profile.pk, profile_pk)
         self.assertEqual(UserProfile.objects.filter(user=user).count(), 1)
 
+    def test_creation_is_two_inserts(self) -> None:
+        """User + profile cost one INSERT each — no get_or_create lookup."""
+        with self.assertNumQueries(2):
+            User.objects.create_user(email="lean@example.com", password="pass1234!")
+
     def test_profile_tenant_is_none_on_creation(self) -> None:
         user = User.objects.create_user(
             email="notable@example.com", password="pass1234!"
@@ -71,9 +71,10 @@ class SettingsRedirectViewTest(TestCase):
 
 
 class SettingsUsersAccessTest(TestCase):
-    def setUp(self):
-        self.admin, self.tenant = _make_admin()
-        self.url = reverse("users:settings_users")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+        cls.url = reverse("users:settings_users")
 
     def test_admin_can_access(self):
         self.client.force_login(self.admin)
@@ -99,9 +100,10 @@ class SettingsUsersAccessTest(TestCase):
 
 @override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
 class SettingsUsersInviteTest(TestCase):
-    def setUp(self):
-        self.admin, self.tenant = _make_admin()
-        self.url = reverse("users:settings_users")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+        cls.url = reverse("users:settings_users")
 
     def test_invite_new_user_creates_and_attaches(self):
         self.client.force_login(self.admin)
@@ -148,10 +150,11 @@ class SettingsUsersInviteTest(TestCase):
 
 
 class SettingsUsersPromoteTest(TestCase):
-    def setUp(self):
-        self.admin, self.tenant = _make_admin()
-        self.member = _make_member(self.tenant)
-        self.url = reverse("users:settings_users")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+        cls.member = _make_member(cls.tenant)
+        cls.url = reverse("users:settings_users")
 
     def test_promote_member_to_admin(self):
         self.client.force_login(self.admin)
@@ -188,6 +191,14 @@ class SettingsUsersPromoteTest(TestCase):
         messages = list(response.context["messages"])
         self.assertTrue(any("not found" in str(m).lower() for m in messages))
 
+    def test_malformed_profile_id_reports_not_found(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            self.url, {"action": "promote", "profile_id": "not-a-uuid"}, follow=True
+        )
+        messages = list(response.context["messages"])
+        self.assertTrue(any("not found" in str(m).lower() for m in messages))
+
 
 # ---------------------------------------------------------------------------
 # /settings/users/ — set_role action (promote/demote via dropdown)
@@ -195,10 +206,11 @@ class SettingsUsersPromoteTest(TestCase):
 
 
 class SettingsUsersSetRoleTest(TestCase):
-    def setUp(self):
-        self.admin, self.tenant = _make_admin()
-        self.member = _make_member(self.tenant)
-        self.url = reverse("users:settings_users")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+        cls.member = _make_member(cls.tenant)
+        cls.url = reverse("users:settings_users")
 
     def test_set_role_to_admin(self):
         self.client.force_login(self.admin)
@@ -280,10 +292,11 @@ class SettingsUsersSetRoleTest(TestCase):
 
 
 class SettingsUsersDeactivateTest(TestCase):
-    def setUp(self):
-        self.admin, self.tenant = _make_admin()
-        self.member = _make_member(self.tenant)
-        self.url = reverse("users:settings_users")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+        cls.member = _make_member(cls.tenant)
+        cls.url = reverse("users:settings_users")
 
     def test_deactivate_member(self):
         self.client.force_login(self.admin)
@@ -333,14 +346,15 @@ class SettingsUsersDeactivateTest(TestCase):
 
 
 class SettingsUsersReengageTest(TestCase):
-    def setUp(self):
-        self.admin, self.tenant = _make_admin()
-        self.revoked = _make_member(
-            self.tenant, email="revoked@example.com", is_active=False
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+        cls.revoked = _make_member(
+            cls.tenant, email="revoked@example.com", is_active=False
         )
-        self.revoked.profile.tenant_revoked_at = timezone.now()
-        self.revoked.profile.save()
-        self.url = reverse("users:settings_users")
+        cls.revoked.profile.tenant_revoked_at = timezone.now()
+        cls.revoked.profile.save()
+        cls.url = reverse("users:settings_users")
 
     def test_reengage_revoked_member(self):
         self.client.force_login(self.admin)
@@ -360,9 +374,10 @@ class SettingsUsersReengageTest(TestCase):
 
 
 class SettingsGeneralViewTest(TestCase):
-    def setUp(self):
-        self.admin, self.tenant = _make_admin()
-        self.url = reverse("users:settings_general")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+        cls.url = reverse("users:settings_general")
 
     def test_admin_can_access(self):
         self.client.force_login(self.admin)
@@ -431,9 +446,10 @@ class SettingsGeneralViewTest(TestCase):
 
 
 class SettingsBillingViewTest(TestCase):
-    def setUp(self):
-        self.admin, self.tenant = _make_admin()
-        self.url = reverse("users:settings_billing")
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.tenant = _make_admin()
+        cls.url = reverse("users:settings_billing")
 
     def test_admin_can_access(self):
         self.client.force_login(self.admin)
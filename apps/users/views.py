@@ -25,12 +25,10 @@ import uuid
 from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, ValidationError
 from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
-from django.utils.encoding import force_str
-from django.utils.http import urlsafe_base64_decode
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_POST
 
@@ -45,13 +43,19 @@ from apps.users.forms import (
     RegisterForm,
     TenantCreateForm,
 )
-from apps.users.geo import country_code_from_timezone, get_client_ip, lookup_from_ip
+from apps.users.geo import (
+    country_code_from_timezone,
+    get_client_ip,
+    lookup_from_ip,
+    prefetch_from_ip,
+)
 from apps.users.models import User, UserProfile
 from apps.users.services import (
     authenticate_user,
     complete_profile,
     create_tenant_for_profile,
     deactivate_member,
+    decode_invite_uid,
     get_user_from_invite_link,
     invite_member,
     promote_to_admin,
@@ -123,13 +127,19 @@ def register_view(request):
             tz_detect = form.cleaned_data.get("tz_detect", "")
             lang_detect = form.cleaned_data.get("lang_detect", "")
             country_detect = form.cleaned_data.get("country_detect", "")
-            user = register_user(
-                email=form.cleaned_data["email"],
-                password=form.cleaned_data["password"],
-                tz_detect=tz_detect,
-                lang_detect=lang_detect,
-            )
+            try:
+                user = register_user(
+                    email=form.cleaned_data["email"],
+                    password=form.cleaned_data["password"],
+                    tz_detect=tz_detect,
+                    lang_detect=lang_detect,
+                )
+            except ValueError as exc:
+                form.add_error("email", str(exc))
+                return render(request, "users/register.html", {"form": form})
             login(request, user)
+            # Warm the geo cache now so the onboarding page doesn't wait on it.
+            prefetch_from_ip(get_client_ip(request))
             # Preserve browser hints in session for use on the onboarding step-1 page
             if tz_detect:
                 request.session["tz_detect"] = tz_detect
@@ -181,7 +191,7 @@ def _org_suggestion_from_email(email: str) -> str:
         if "." in stem:
             stem = stem.rsplit(".", 1)[-1]
         return stem.replace("-", " ").replace("_", " ").title()
-    except IndexError, AttributeError:
+    except (IndexError, AttributeError):
         return ""
 
 
@@ -250,7 +260,9 @@ def profile_complete_view(request):
         # country_detect comes from the region subtag of navigator.language
         # e.g. "nl-BE" → "BE".  This is a browser signal, works on localhost.
         if sess_country and not profile.country_id:
-            country_obj = Country.objects.filter(code__iexact=sess_country).first()
+            # Country codes are stored upper-case: a plain equality lookup can
+            # use the unique index, unlike __iexact's LOWER(code) predicate.
+            country_obj = Country.objects.filter(code=sess_country.upper()).first()
             if country_obj:
                 initial["country"] = country_obj.pk
 
@@ -434,7 +446,11 @@ def invite_member_view(request):
 def revoke_member_view(request, profile_id: uuid.UUID):
     """Admin revokes a member's access."""
     admin_profile = _require_admin(request)
-    target = get_object_or_404(UserProfile, pk=profile_id, tenant=admin_profile.tenant)
+    target = get_object_or_404(
+        UserProfile.objects.select_related("user"),
+        pk=profile_id,
+        tenant=admin_profile.tenant,
+    )
     try:
         revoke_member(admin_profile=admin_profile, target_profile=target)
         messages.success(
@@ -452,7 +468,11 @@ def revoke_member_view(request, profile_id: uuid.UUID):
 def reengage_member_view(request, profile_id: uuid.UUID):
     """Admin re-engages a revoked member."""
     admin_profile = _require_admin(request)
-    target = get_object_or_404(UserProfile, pk=profile_id, tenant=admin_profile.tenant)
+    target = get_object_or_404(
+        UserProfile.objects.select_related("user"),
+        pk=profile_id,
+        tenant=admin_profile.tenant,
+    )
     try:
         reengage_member(admin_profile=admin_profile, target_profile=target)
         messages.success(
@@ -553,10 +573,10 @@ def settings_users_view(request):
         if action in ("promote", "deactivate", "reengage", "set_role"):
             profile_id = request.POST.get("profile_id", "")
             try:
-                target = UserProfile.objects.get(
+                target = UserProfile.objects.select_related("user").get(
                     pk=profile_id, tenant=admin_profile.tenant
                 )
-            except UserProfile.DoesNotExist, ValueError:
+            except (UserProfile.DoesNotExist, ValidationError):
                 messages.error(request, _("Member not found."))
                 return redirect("users:settings_users")
 
@@ -691,11 +711,8 @@ def invite_accept_view(request, uidb64: str, token: str):
         # Token is invalid or expired.  Decode the uid independently to check
         # whether the user already has a password — if so, show the friendlier
         # "already accepted" page rather than the generic invalid-link page.
-        try:
-            uid = force_str(urlsafe_base64_decode(uidb64))
-            candidate = User.objects.get(pk=uid)
-        except Exception:  # noqa: BLE001
-            candidate = None
+        uid = decode_invite_uid(uidb64)
+        candidate = User.objects.filter(pk=uid).first() if uid is not None else None
 
         if candidate is not None and candidate.has_usable_password():
             return render(request, "users/invite_already_accepted.html", status=200)
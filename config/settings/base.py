@@ -56,6 +56,12 @@ INSTALLED_APPS = [
 
 AUTH_USER_MODEL = "users.User"
 
+# ModelBackend + select_related("profile", "profile__tenant") on the
+# per-request user lookup. The only backend, so a failed login hashes once;
+# sessions that still name the stock ModelBackend are moved over by
+# LegacySessionBackendMiddleware.
+AUTHENTICATION_BACKENDS = ["apps.users.backends.ProfileModelBackend"]
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -63,6 +69,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.users.middleware.LegacySessionBackendMiddleware",
     "apps.users.middleware.ProfileCompleteMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -116,6 +123,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Django's default list, with PBKDF2-SHA256 iterations taken from the
+# environment (calibrate with `manage.py calibrate_password_hasher`).
+PASSWORD_HASHERS = [
+    "apps.users.hashers.TunedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# Unset, or below Django's release default, means that default.
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", default=None)
+
 # ---------------------------------------------------------------------------
 # Internationalisation
 # ---------------------------------------------------------------------------
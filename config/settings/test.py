@@ -0,0 +1,37 @@
+"""
+Test settings.
+
+Inherits from dev and swaps in faster, test-only defaults.
+Selected automatically by manage.py when running `manage.py test`.
+The database stays on PostgreSQL — never SQLite, even for tests.
+"""
+
+from .dev import *  # noqa: F401, F403
+
+DEBUG = False
+
+# PBKDF2 is deliberately slow; MD5 is fine for throwaway test users.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Cached template fragments (e.g. the homepage hero) would otherwise serve
+# markup rendered by an earlier test, in that test's language.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+# Uploads (e.g. Tenant.logo) stay in memory — no files left under MEDIA_ROOT.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class DisableMigrations:
+    """Build the test database straight from models instead of replaying migrations."""
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()